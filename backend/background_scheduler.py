@@ -17,7 +17,7 @@ from orchestration import ChatOrchestrator
 from orchestration.agent_ordering import separate_interrupt_agents
 from orchestration.tape import TapeExecutor, TapeGenerator
 from sdk import AgentManager
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -255,13 +255,7 @@ class BackgroundScheduler:
 
     async def _count_agent_messages(self, db: AsyncSession, room_id: int) -> int:
         """Count the number of agent messages (role='assistant') in a room."""
-        result = await db.execute(
-            select(func.count(models.Message.id)).where(
-                models.Message.room_id == room_id,
-                models.Message.role == "assistant",
-            )
-        )
-        return result.scalar() or 0
+        return await crud.count_agent_messages(db, room_id)
 
     async def _cleanup_cache(self):
         """
@@ -12,8 +12,11 @@ from typing import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from httpx import ASGITransport, AsyncClient, Response
+from pytest_asyncio import is_async_test
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 # Add backend directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -27,42 +30,73 @@ from sdk import AgentManager
 
 # Configure pytest-asyncio
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an event loop for the test session."""
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """Use uvloop for the test event loop when it is available (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
 
 
-@pytest.fixture(scope="function")
-async def test_db() -> AsyncGenerator[AsyncSession, None]:
+def pytest_collection_modifyitems(items):
+    """Run every async test in the single session-scoped event loop."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
     """
-    Create a fresh test database for each test function.
+    Create the test database engine and schema once per test session.
 
-    Uses an in-memory SQLite database that is created and destroyed
-    for each test to ensure isolation.
+    The database lives in memory behind a StaticPool, so every checkout reuses
+    the same connection and no file I/O is involved. Individual tests never
+    commit to it; see test_db for per-test isolation.
     """
-    # Use in-memory SQLite for tests
-    test_engine = create_async_engine(
-        "sqlite+aiosqlite:///:memory:", echo=False, connect_args={"check_same_thread": False}
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
     )
 
-    # Create tables
-    async with test_engine.begin() as conn:
+    # pysqlite's implicit transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    # Create session
-    TestingSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    yield engine
 
-    async with TestingSessionLocal() as session:
-        yield session
+    await engine.dispose()
 
-    # Drop tables after test
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
 
-    await test_engine.dispose()
+@pytest.fixture(scope="function")
+async def test_db(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a database session whose changes are rolled back after each test.
+
+    The session is bound to an outer transaction on a dedicated connection;
+    commits inside the test (or the API under test) only release SAVEPOINTs,
+    so teardown is a single ROLLBACK instead of dropping the schema.
+    """
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
 
 
 def _setup_app_state():
@@ -81,16 +115,55 @@ def _setup_app_state():
         app.state.background_scheduler = MagicMock()
 
 
-@pytest.fixture(scope="function")
-async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+class TokenClient:
     """
-    Create a test client with authentication bypassed.
+    View over the shared test client that sends a fixed X-API-Key header.
 
-    This fixture overrides the database dependency to use the test database
-    and removes authentication middleware for easier testing.
+    Lets admin and guest fixtures coexist in one test while reusing the same
+    session-wide AsyncClient and transport.
+    """
+
+    def __init__(self, http_client: AsyncClient, token: str):
+        self._client = http_client
+        self._headers = {"X-API-Key": token}
+
+    async def request(self, method: str, url: str, **kwargs) -> Response:
+        headers = {**self._headers, **(kwargs.pop("headers", None) or {})}
+        return await self._client.request(method, url, headers=headers, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    Create one ASGI test client shared by every test in the session.
+
+    ASGITransport does not run the app lifespan, so the mocked app state that
+    lifespan would normally provide is installed here, once per session.
     """
-    # Set up app state
     _setup_app_state()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="function")
+def override_db(test_db: AsyncSession):
+    """Route the app's get_db dependency to the test database for one test."""
 
     # Override the get_db dependency to use test database
     async def override_get_db():
@@ -98,80 +171,55 @@ async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    # Create test client
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    yield
 
     # Clean up
     app.dependency_overrides.clear()
 
 
 @pytest.fixture(scope="function")
-async def authenticated_client(test_db: AsyncSession) -> AsyncGenerator[tuple[AsyncClient, str], None]:
+def client(http_client: AsyncClient, override_db) -> AsyncClient:
     """
-    Create a test client with a valid JWT token.
+    Create a test client with authentication bypassed.
 
-    Returns:
-        tuple: (AsyncClient, token) - The test client and the JWT token
+    This fixture overrides the database dependency to use the test database
+    and removes authentication middleware for easier testing.
     """
-    from auth import generate_jwt_token
+    return http_client
 
-    # Set up app state
-    _setup_app_state()
 
-    # Override the get_db dependency to use test database
-    async def override_get_db():
-        yield test_db
+@pytest.fixture(scope="function")
+def authenticated_client(http_client: AsyncClient, override_db) -> tuple[TokenClient, str]:
+    """
+    Create a test client with a valid JWT token.
 
-    app.dependency_overrides[get_db] = override_get_db
+    Returns:
+        tuple: (TokenClient, token) - The test client and the JWT token
+    """
+    from auth import generate_jwt_token
 
     # Generate a valid JWT token
     token = generate_jwt_token(role="admin", user_id="admin")
-
-    # Create test client with auth header
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test", headers={"X-API-Key": token}) as ac:
-        yield ac, token
-
-    # Clean up
-    app.dependency_overrides.clear()
+    return TokenClient(http_client, token), token
 
 
 @pytest.fixture(scope="function")
-async def guest_client(test_db: AsyncSession) -> AsyncGenerator[tuple[AsyncClient, str], None]:
+def guest_client(http_client: AsyncClient, override_db) -> tuple[TokenClient, str]:
     """
     Create a test client with a valid guest JWT token.
 
     Returns:
-        tuple: (AsyncClient, token) - The test client and the JWT token
+        tuple: (TokenClient, token) - The test client and the JWT token
     """
     from auth import generate_jwt_token
 
-    # Set up app state
-    _setup_app_state()
-
-    # Override the get_db dependency to use test database
-    async def override_get_db():
-        yield test_db
-
-    app.dependency_overrides[get_db] = override_get_db
-
     # Generate a valid JWT token with guest role
     token = generate_jwt_token(role="guest", user_id="guest-test")
-
-    # Create test client with auth header
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test", headers={"X-API-Key": token}) as ac:
-        yield ac, token
-
-    # Clean up
-    app.dependency_overrides.clear()
+    return TokenClient(http_client, token), token
 
 
-@pytest.fixture
-async def sample_agent(test_db: AsyncSession) -> models.Agent:
-    """Create a sample agent for testing."""
+async def make_sample_agent(session: AsyncSession) -> models.Agent:
+    """Insert and commit the standard sample agent row."""
     agent = models.Agent(
         name="test_agent",
         group="test_group",
@@ -182,8 +230,37 @@ async def sample_agent(test_db: AsyncSession) -> models.Agent:
         system_prompt="You are a test agent.",
         is_critic=False,
     )
-    test_db.add(agent)
-    await test_db.commit()
+    session.add(agent)
+    await session.commit()
+    return agent
+
+
+async def make_sample_room(session: AsyncSession) -> models.Room:
+    """Insert and commit the standard sample room row."""
+    room = models.Room(name="test_room", max_interactions=None, is_paused=False, owner_id="admin")
+    session.add(room)
+    await session.commit()
+    return room
+
+
+async def make_sample_message(session: AsyncSession, room: models.Room, agent: models.Agent) -> models.Message:
+    """Insert and commit the standard sample message row."""
+    message = models.Message(
+        room_id=room.id,
+        agent_id=agent.id,
+        content="This is a test message",
+        role="assistant",
+        thinking="Test thinking process",
+    )
+    session.add(message)
+    await session.commit()
+    return message
+
+
+@pytest.fixture
+async def sample_agent(test_db: AsyncSession) -> models.Agent:
+    """Create a sample agent for testing."""
+    agent = await make_sample_agent(test_db)
     await test_db.refresh(agent)
     return agent
 
@@ -191,9 +268,7 @@ async def sample_agent(test_db: AsyncSession) -> models.Agent:
 @pytest.fixture
 async def sample_room(test_db: AsyncSession) -> models.Room:
     """Create a sample room for testing."""
-    room = models.Room(name="test_room", max_interactions=None, is_paused=False, owner_id="admin")
-    test_db.add(room)
-    await test_db.commit()
+    room = await make_sample_room(test_db)
     await test_db.refresh(room)
     return room
 
@@ -214,15 +289,7 @@ async def sample_room_with_agents(
 @pytest.fixture
 async def sample_message(test_db: AsyncSession, sample_room: models.Room, sample_agent: models.Agent) -> models.Message:
     """Create a sample message for testing."""
-    message = models.Message(
-        room_id=sample_room.id,
-        agent_id=sample_agent.id,
-        content="This is a test message",
-        role="assistant",
-        thinking="Test thinking process",
-    )
-    test_db.add(message)
-    await test_db.commit()
+    message = await make_sample_message(test_db, sample_room, sample_agent)
     await test_db.refresh(message)
     return message
 
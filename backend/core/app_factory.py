@@ -12,6 +12,7 @@ from pathlib import Path
 import crud
 from background_scheduler import BackgroundScheduler
 from database import get_db, init_db
+from dependencies import bind_singletons
 from fastapi import FastAPI
 from fastapi_mcp import FastApiMCP
 from orchestration import ChatOrchestrator
@@ -56,7 +57,10 @@ def create_app() -> FastAPI:
         # Create singleton instances
         agent_manager = AgentManager()
         priority_agent_names = settings.get_priority_agent_names()
-        chat_orchestrator = ChatOrchestrator(priority_agent_names=priority_agent_names)
+        chat_orchestrator = ChatOrchestrator(
+            priority_agent_names=priority_agent_names,
+            debounce_ms=settings.user_message_debounce_ms,
+        )
         background_scheduler = BackgroundScheduler(
             chat_orchestrator=chat_orchestrator,
             agent_manager=agent_manager,
@@ -75,6 +79,7 @@ def create_app() -> FastAPI:
         app.state.agent_manager = agent_manager
         app.state.chat_orchestrator = chat_orchestrator
         app.state.background_scheduler = background_scheduler
+        bind_singletons(agent_manager, chat_orchestrator)
 
         # Seed agents from config files
         async for db in get_db():
@@ -92,6 +97,7 @@ def create_app() -> FastAPI:
         logger.info("🛑 Application shutdown...")
         background_scheduler.stop()
         await agent_manager.shutdown()
+        bind_singletons(None, None)
         logger.info("✅ Application shutdown complete")
 
     # Initialize rate limiter
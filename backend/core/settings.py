@@ -128,6 +128,10 @@ class Settings(BaseSettings):
     # Background scheduler configuration
     max_concurrent_rooms: int = 5
 
+    # Orchestration configuration
+    # Window (ms) in which rapid user messages to one room are coalesced into one agent pass; 0 disables
+    user_message_debounce_ms: int = 0
+
     # Deprecated settings (kept for backwards compatibility warnings)
     enable_recall_tool: Optional[str] = None
     enable_memory_tool: Optional[str] = None
@@ -35,7 +35,9 @@ from .cached import (
 
 # Message operations
 from .messages import (
+    count_agent_messages,
     create_message,
+    create_messages,
     delete_room_messages,
     get_critic_messages,
     get_messages,
@@ -84,11 +86,13 @@ __all__ = [
     "seed_agents_from_configs",
     # Message operations
     "create_message",
+    "create_messages",
     "get_messages",
     "get_messages_since",
     "get_recent_messages",
     "get_messages_after_agent_response",
     "get_critic_messages",
+    "count_agent_messages",
     "delete_room_messages",
     # Room-Agent relationship operations
     "get_agents",
@@ -279,7 +279,7 @@ async def append_agent_memory(db: AsyncSession, agent_id: int, memory_entry: str
     # Database will be loaded fresh from filesystem on next read via get_config_data()
     if agent.config_file:
         timestamp = datetime.utcnow()
-        success = AgentConfigService.append_to_recent_events(
+        success = await AgentConfigService.append_to_recent_events_async(
             config_file=agent.config_file, memory_entry=memory_entry, timestamp=timestamp
         )
         if success:
@@ -7,7 +7,7 @@ from typing import List
 
 import models
 import schemas
-from sqlalchemy import delete
+from sqlalchemy import delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -65,6 +65,62 @@ async def create_message(
     return db_message
 
 
+async def create_messages(
+    db: AsyncSession, room_id: int, messages: List[schemas.MessageCreate], update_room_activity: bool = False
+) -> List[models.Message]:
+    """
+    Create several messages in one transaction.
+
+    Same checks as create_message, but the room lookup, cache invalidation and commit
+    happen once for the whole batch instead of once per message.
+
+    Args:
+        db: Database session
+        room_id: Room ID
+        messages: Messages to create, in insertion order
+        update_room_activity: Whether to update room's last_activity_at (default: False)
+
+    Returns:
+        Created messages
+    """
+    if not messages:
+        return []
+
+    room = await db.get(models.Room, room_id)
+    if not room:
+        from exceptions import RoomNotFoundError
+
+        raise RoomNotFoundError(room_id)
+
+    db_messages = [
+        models.Message(
+            room_id=room_id,
+            agent_id=message.agent_id,
+            content=message.content,
+            role=message.role,
+            participant_type=message.participant_type,
+            participant_name=message.participant_name,
+            thinking=message.thinking,
+            image_data=message.image_data,
+            image_media_type=message.image_media_type,
+        )
+        for message in messages
+    ]
+    db.add_all(db_messages)
+
+    if update_room_activity:
+        room.last_activity_at = datetime.utcnow()
+
+    # Invalidate cache BEFORE commit (see create_message)
+    from infrastructure.cache import get_cache, room_messages_key
+
+    get_cache().invalidate_pattern(room_messages_key(room_id))
+
+    await db.commit()
+
+    return db_messages
+
+
 async def create_system_message(
     db: AsyncSession, room_id: int, content: str, update_room_activity: bool = False
 ) -> models.Message:
@@ -243,6 +299,16 @@ async def _get_agent_joined_at(db: AsyncSession, room_id: int, agent_id: int):
     return result.scalar_one_or_none()
 
 
+async def count_agent_messages(db: AsyncSession, room_id: int) -> int:
+    """Count agent messages (role='assistant') in a room."""
+    stmt = (
+        select(func.count())
+        .select_from(models.Message)
+        .where(models.Message.room_id == room_id, models.Message.role == "assistant")
+    )
+    return (await db.execute(stmt)).scalar_one()
+
+
 async def get_critic_messages(db: AsyncSession, room_id: int) -> List[models.Message]:
     """Get messages from critic agents only."""
     result = await db.execute(
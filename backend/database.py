@@ -3,8 +3,10 @@ import os
 import platform
 from pathlib import Path
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,12 @@ def _is_sqlite_url(url: str) -> bool:
     return "sqlite" in url.lower()
 
 
+def _is_sqlite_memory_url(url: str) -> bool:
+    """Check if a SQLite URL points at an in-memory database."""
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+
+
 def _get_database_url() -> str:
     """
     Determine the appropriate database URL.
@@ -55,7 +63,16 @@ def get_engine():
         database_url = _get_database_url()
         is_sqlite = _is_sqlite_url(database_url)
 
-        if is_sqlite:
+        if is_sqlite and _is_sqlite_memory_url(database_url):
+            # In-memory SQLite exists per connection, so every session must share a single one
+            _engine = create_async_engine(
+                database_url,
+                echo=False,
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+            logger.info(f"Database engine created: SQLite in-memory ({database_url})")
+        elif is_sqlite:
             # SQLite configuration - no connection pooling
             _engine = create_async_engine(
                 database_url,
@@ -1,6 +1,6 @@
 """Shared dependencies for FastAPI endpoints."""
 
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 import crud
 from exceptions import RoomNotFoundError
@@ -9,6 +9,18 @@ from orchestration import ChatOrchestrator
 from sdk import AgentManager
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Process-lifetime singletons bound by the app lifespan, so per-request dependency
+# resolution is a global read instead of walking request.app.state
+_agent_manager: Optional[AgentManager] = None
+_chat_orchestrator: Optional[ChatOrchestrator] = None
+
+
+def bind_singletons(agent_manager: Optional[AgentManager], chat_orchestrator: Optional[ChatOrchestrator]) -> None:
+    """Bind (or, with None, unbind) the instances returned by the dependencies below."""
+    global _agent_manager, _chat_orchestrator
+    _agent_manager = agent_manager
+    _chat_orchestrator = chat_orchestrator
+
 
 class RequestIdentity(NamedTuple):
     role: str
@@ -40,6 +52,8 @@ def get_agent_manager(request: Request) -> AgentManager:
 
     The instance is created during application startup in the lifespan context.
     """
+    if _agent_manager is not None:
+        return _agent_manager
     return request.app.state.agent_manager
 
 
@@ -49,4 +63,6 @@ def get_chat_orchestrator(request: Request) -> ChatOrchestrator:
 
     The instance is created during application startup in the lifespan context.
     """
+    if _chat_orchestrator is not None:
+        return _chat_orchestrator
     return request.app.state.chat_orchestrator
@@ -16,7 +16,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageContext:
     """
     Context for message operations.
@@ -35,7 +35,7 @@ class MessageContext:
     agent: "models.Agent"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentMessageData:
     """
     Data for agent message to broadcast.
@@ -51,7 +51,7 @@ class AgentMessageData:
     anthropic_calls: Optional[list[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OrchestrationContext:
     """
     Shared context for orchestration operations.
@@ -63,11 +63,14 @@ class OrchestrationContext:
         db: Database session
         room_id: Room ID
         agent_manager: AgentManager for generating responses
+        room: Room fetched by the tape executor for the cell being executed, so response
+              generation can reuse it instead of fetching it again (None outside a cell)
     """
 
     db: "AsyncSession"
     room_id: int
     agent_manager: "AgentManager"
+    room: Optional["models.Room"] = None
 
 
 @dataclass
@@ -5,6 +5,20 @@ Automatically selects the correct Korean particle (조사) based on whether
 a word ends in a consonant (받침) or vowel.
 """
 
+import re
+
+# Particle mappings: {pattern: (consonant_form, vowel_form)}
+_PARTICLES = {
+    "은는": ("은", "는"),
+    "이가": ("이", "가"),
+    "을를": ("을", "를"),
+    "과와": ("과", "와"),
+    "으로로": ("으로", "로"),
+}
+
+# Matches {name} and {name:<particle pattern>} in a single scan of the template
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)(?::(" + "|".join(map(re.escape, _PARTICLES)) + r"))?\}")
+
 
 def has_final_consonant(text: str) -> bool:
     """
@@ -64,29 +78,19 @@ def format_with_particles(template: str, **kwargs) -> str:
     Returns:
         Formatted string with correct particles
     """
-    result = template
-
-    # Particle mappings: {pattern: (consonant_form, vowel_form)}
-    particles = {
-        "은는": ("은", "는"),
-        "이가": ("이", "가"),
-        "을를": ("을", "를"),
-        "과와": ("과", "와"),
-        "으로로": ("으로", "로"),
-    }
-
-    # Replace each variable with particle pattern
-    for var_name, var_value in kwargs.items():
-        for pattern, (consonant_form, vowel_form) in particles.items():
-            placeholder = f"{{{var_name}:{pattern}}}"
-
-            if placeholder in result:
-                # Choose particle based on final consonant
-                particle = consonant_form if has_final_consonant(var_value) else vowel_form
-                result = result.replace(placeholder, var_value + particle)
-
-        # Also replace simple placeholders without particles
-        simple_placeholder = f"{{{var_name}}}"
-        result = result.replace(simple_placeholder, var_value)
-
-    return result
+
+    def _substitute(match: re.Match) -> str:
+        var_name, pattern = match.groups()
+        if var_name not in kwargs:
+            # Leave placeholders for unknown variables untouched
+            return match.group(0)
+
+        var_value = kwargs[var_name]
+        if pattern is None:
+            return var_value
+
+        # Choose particle based on final consonant
+        consonant_form, vowel_form = _PARTICLES[pattern]
+        return var_value + (consonant_form if has_final_consonant(var_value) else vowel_form)
+
+    return _PLACEHOLDER_RE.sub(_substitute, template)
@@ -37,7 +37,7 @@ class WriteOperation:
 
     def __init__(self, coro: Awaitable[T]):
         self.coro = coro
-        self.future: asyncio.Future[T] = asyncio.get_event_loop().create_future()
+        self.future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
 
 
 async def _writer_loop():
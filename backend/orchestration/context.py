@@ -11,6 +11,7 @@ from core import get_settings
 from core.settings import SKIP_MESSAGE_TEXT
 from domain.enums import ParticipantType
 from i18n.korean import format_with_particles
+from infrastructure.cache import get_cache, room_messages_key
 from sdk.config import get_conversation_context_config
 
 from orchestration.whiteboard import process_messages_for_whiteboard
@@ -27,6 +28,7 @@ def build_conversation_context(
     agent_count: Optional[int] = None,
     user_name: Optional[str] = None,
     include_response_instruction: bool = True,
+    room_id: Optional[int] = None,
 ) -> List[dict]:
     """
     Build conversation context from recent room messages for multi-agent awareness.
@@ -42,6 +44,8 @@ def build_conversation_context(
         agent_count: Number of agents in the room (for detecting 1-on-1 conversations)
         user_name: Name of the user/character participant (for 1-on-1 conversations)
         include_response_instruction: If True, append response instruction; if False, only include conversation history
+        room_id: If provided, memoize the result briefly under the room's message cache namespace,
+            so it is dropped together with the message cache when a new message is saved
 
     Returns:
         List of content blocks: [{"type": "text", "text": "..."}, {"type": "image", "source": {...}}, ...]
@@ -49,6 +53,34 @@ def build_conversation_context(
     if not messages:
         return []
 
+    if room_id is None:
+        return _build_content_blocks(messages, limit, agent_id, agent_name, user_name, include_response_instruction)
+
+    # The last message ID pins the history tail; everything else that shapes the output is in the key too
+    cache = get_cache()
+    key = (
+        f"{room_messages_key(room_id)}:context:{agent_id}:{messages[-1].id}:{limit}:"
+        f"{agent_name}:{agent_count}:{user_name}:{include_response_instruction}"
+    )
+    content_blocks = cache.get(key)
+    if content_blocks is None:
+        content_blocks = _build_content_blocks(
+            messages, limit, agent_id, agent_name, user_name, include_response_instruction
+        )
+        cache.set(key, content_blocks, ttl_seconds=5)
+    return content_blocks
+
+
+def _build_content_blocks(
+    messages: List,
+    limit: int,
+    agent_id: Optional[int],
+    agent_name: Optional[str],
+    user_name: Optional[str],
+    include_response_instruction: bool,
+) -> List[dict]:
+    """Build the content blocks for build_conversation_context (uncached)."""
+
     # If agent_id is provided, find messages after the agent's last response
     if agent_id is not None:
         # Find the index of the agent's last message
@@ -81,11 +113,13 @@ def build_conversation_context(
 
     # Start with header
     header = config.get("header", "Here's the conversation so far:")
-    current_text = header + "\n"
+    # Accumulate text pieces and join once per block instead of repeated += concatenation
+    text_parts: List[str] = [header, "\n"]
 
     # Process whiteboard messages to get rendered content (accumulated state)
-    # This converts diff format to full rendered whiteboard for other agents
-    whiteboard_rendered = process_messages_for_whiteboard(messages)
+    # This converts diff format to full rendered whiteboard for other agents.
+    # recent_messages is always a tail of messages, so only that window is rendered.
+    whiteboard_rendered = process_messages_for_whiteboard(messages, render_from=len(messages) - len(recent_messages))
 
     # Track seen messages to avoid duplicates (speaker, content) pairs
     seen_messages = set()
@@ -138,7 +172,8 @@ def build_conversation_context(
 
         if has_image:
             # Add accumulated text as a block, then image inline within the XML tag
-            current_text += f"<{tag_name}>"
+            text_parts.append(f"<{tag_name}>")
+            current_text = "".join(text_parts)
             if current_text.strip():
                 content_blocks.append({"type": "text", "text": current_text})
 
@@ -156,31 +191,32 @@ def build_conversation_context(
 
             # Continue with content and closing tag
             if content:
-                current_text = f"\n{content}</{tag_name}>\n"
+                text_parts = [f"\n{content}</{tag_name}>\n"]
             else:
-                current_text = f"</{tag_name}>\n"
+                text_parts = [f"</{tag_name}>\n"]
         else:
             # No image - just add text
-            current_text += f"<{tag_name}>{content}</{tag_name}>\n"
+            text_parts.append(f"<{tag_name}>{content}</{tag_name}>\n")
 
     # Add footer (closing tag) after conversation messages
     footer = config.get("footer", "")
     if footer:
-        current_text += footer + "\n"
+        text_parts.append(f"{footer}\n")
 
     # Add recall tool reminder when including instructions
     if include_response_instruction:
         recall_reminder = config.get("recall_reminder", "")
         if recall_reminder:
-            current_text += f"\n{recall_reminder}\n"
+            text_parts.append(f"\n{recall_reminder}\n")
 
     # Add response instruction (if requested)
     if include_response_instruction and agent_name:
         instruction = config.get("response_instruction", "")
         if instruction:
-            current_text += format_with_particles(instruction, agent_name=agent_name, user_name=user_name or "")
+            text_parts.append(format_with_particles(instruction, agent_name=agent_name, user_name=user_name or ""))
 
     # Add any remaining text as a final block
+    current_text = "".join(text_parts)
     if current_text.strip():
         content_blocks.append({"type": "text", "text": current_text.strip()})
 
@@ -8,7 +8,7 @@ including context building, response generation, and message broadcasting.
 import asyncio
 import logging
 import time
-from typing import List
+from typing import Awaitable, Callable, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -41,35 +41,39 @@ class ChatOrchestrator:
         max_follow_up_rounds: int = MAX_FOLLOW_UP_ROUNDS,
         max_total_messages: int = MAX_TOTAL_MESSAGES,
         priority_agent_names: List[str] = None,
+        debounce_ms: int = 0,
+        interrupt_hook: Optional[Callable[..., Awaitable[None]]] = None,
     ):
         self.max_follow_up_rounds = max_follow_up_rounds
         self.max_total_messages = max_total_messages
         self.priority_agent_names = priority_agent_names or []
+        # Coalesce rapid user messages per room into one orchestration pass (0 disables)
+        self.debounce_ms = debounce_ms
+        # Latest message data per room while a pass waits out the debounce window
+        self._pending_user_messages: dict[int, dict] = {}
+        # Called as hook(room_id, agent_manager, db=db) before each user message is processed
+        # (defaults to interrupt_room_processing; tests inject a stub here)
+        self._interrupt = interrupt_hook or self.interrupt_room_processing
         # Track active processing tasks per room for interruption
         self.active_room_tasks: dict[int, asyncio.Task] = {}
         # Used to skip broadcasting responses that were started before the interruption
-        self.last_user_message_time: dict[int, float] = {}
+        # (time.monotonic_ns() values, so wall-clock adjustments can't reorder them)
+        self.last_user_message_time: dict[int, int] = {}
         # Initialize response generator
         self.response_generator = ResponseGenerator(self.last_user_message_time)
 
-    def get_chatting_agents(self, room_id: int, agent_manager: AgentManager) -> list[int]:
+    def get_chatting_agents(self, room_id: int, agent_manager: AgentManager) -> frozenset[int]:
         """
-        Get list of agent IDs currently chatting (generating responses) in a room.
+        Get the IDs of agents currently chatting (generating responses) in a room.
 
         Args:
             room_id: Room ID
             agent_manager: AgentManager instance
 
         Returns:
-            List of agent IDs currently processing in this room
+            Unordered set of agent IDs currently processing in this room
         """
-        chatting_agent_ids = []
-
-        for task_id in agent_manager.active_clients.keys():
-            if task_id.room_id == room_id:
-                chatting_agent_ids.append(task_id.agent_id)
-
-        return chatting_agent_ids
+        return frozenset(agent_manager.clients_by_room.get(room_id, ()))
 
     async def interrupt_room_processing(
         self,
@@ -101,11 +105,13 @@ class ChatOrchestrator:
                 except asyncio.CancelledError:
                     pass  # Expected
 
-        # Interrupt all agents in this room via the agent manager
-        await agent_manager.interrupt_room(room_id)
+        # Interrupt all agents in this room via the agent manager (skipped for idle rooms)
+        if agent_manager.clients_by_room.get(room_id):
+            await agent_manager.interrupt_room(room_id)
 
-        # Save any partial responses that have content
+        # Save any partial responses that have content (in one transaction)
         if save_partial_responses and db and partial_responses:
+            messages = []
             for agent_id, state in partial_responses.items():
                 response_text = state.get("response_text", "").strip()
                 thinking_text = state.get("thinking_text", "")
@@ -116,13 +122,16 @@ class ChatOrchestrator:
                         f"💾 Saving partial response | Room: {room_id} | Agent: {agent_id} | "
                         f"Length: {len(response_text)} chars"
                     )
-                    message = schemas.MessageCreate(
-                        content=response_text,
-                        role="assistant",
-                        agent_id=agent_id,
-                        thinking=thinking_text if thinking_text else None,
+                    messages.append(
+                        schemas.MessageCreate(
+                            content=response_text,
+                            role="assistant",
+                            agent_id=agent_id,
+                            thinking=thinking_text if thinking_text else None,
+                        )
                     )
-                    await crud.create_message(db, room_id, message, update_room_activity=False)
+            if messages:
+                await crud.create_messages(db, room_id, messages, update_room_activity=False)
 
     async def cleanup_room_state(self, room_id: int, agent_manager: AgentManager):
         """
@@ -139,13 +148,11 @@ class ChatOrchestrator:
         await self.interrupt_room_processing(room_id, agent_manager, save_partial_responses=False)
 
         # Remove from active tasks tracking (may already be removed by interrupt, but ensure it's gone)
-        if room_id in self.active_room_tasks:
-            del self.active_room_tasks[room_id]
+        if self.active_room_tasks.pop(room_id, None) is not None:
             logger.info(f"✅ Removed room {room_id} from active_room_tasks")
 
         # Remove from last user message time tracking
-        if room_id in self.last_user_message_time:
-            del self.last_user_message_time[room_id]
+        if self.last_user_message_time.pop(room_id, None) is not None:
             logger.info(f"✅ Removed room {room_id} from last_user_message_time")
 
         logger.info(f"✅ Room state cleanup complete | Room: {room_id}")
@@ -174,7 +181,7 @@ class ChatOrchestrator:
         logger.info(f"🔵 USER MESSAGE RECEIVED | Room: {room_id} | Content: {message_data.get('content', '')[:50]}")
 
         # Record the timestamp of this user message for interruption tracking
-        self.last_user_message_time[room_id] = time.time()
+        self.last_user_message_time[room_id] = time.monotonic_ns()
 
         # Save user message FIRST (only if not already saved)
         if saved_user_message_id is None:
@@ -197,9 +204,24 @@ class ChatOrchestrator:
             f"💾 USER MESSAGE SAVED | Room: {room_id} | ID: {saved_user_msg.id} | Content: {saved_user_msg.content[:50]}"
         )
 
+        # Coalesce bursts: if a pass for this room is already waiting out the debounce window,
+        # hand it this message's data and let it run instead (the message is already saved,
+        # so the agents still see it in their conversation context)
+        if self.debounce_ms > 0:
+            if room_id in self._pending_user_messages:
+                self._pending_user_messages[room_id] = message_data
+                logger.info(f"⏳ USER MESSAGE COALESCED | Room: {room_id}")
+                return
+
+            self._pending_user_messages[room_id] = message_data
+            try:
+                await asyncio.sleep(self.debounce_ms / 1000)
+            finally:
+                message_data = self._pending_user_messages.pop(room_id)
+
         # NOW interrupt any ongoing agent processing for this room
         # Save any partial responses that were in-progress
-        await self.interrupt_room_processing(room_id, agent_manager, db=db)
+        await self._interrupt(room_id, agent_manager, db=db)
         logger.info(f"🛑 INTERRUPTED | Room: {room_id}")
 
         # Get all agents for the room (use cache for performance)
@@ -260,8 +282,8 @@ class ChatOrchestrator:
 
             traceback.print_exc()
         finally:
-            # Clean up task tracking
-            if room_id in self.active_room_tasks and self.active_room_tasks[room_id] == processing_task:
+            # Clean up task tracking (unless a newer message already replaced it)
+            if self.active_room_tasks.get(room_id) is processing_task:
                 del self.active_room_tasks[room_id]
 
     async def _process_agent_responses(
@@ -281,6 +303,11 @@ class ChatOrchestrator:
         """
         logger.info(f"📝 _process_agent_responses called | Room: {orch_context.room_id}")
 
+        # Nothing to schedule: skip building tapes and the room lookups they trigger
+        if not agents and not interrupt_agents and not critic_agents:
+            logger.info(f"⏭️  No agents to respond | Room: {orch_context.room_id}")
+            return
+
         # Build agent lookup dict
         all_agents = agents + interrupt_agents
         agents_by_id = {a.id: a for a in all_agents}
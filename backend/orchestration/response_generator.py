@@ -37,12 +37,12 @@ class ResponseGenerator:
     - Broadcasting responses to clients
     """
 
-    def __init__(self, last_user_message_time: dict[int, float]):
+    def __init__(self, last_user_message_time: dict[int, int]):
         """
         Initialize the response generator.
 
         Args:
-            last_user_message_time: Shared dict tracking last user message timestamp per room
+            last_user_message_time: Shared dict tracking last user message time per room (time.monotonic_ns())
         """
         self.last_user_message_time = last_user_message_time
 
@@ -69,13 +69,15 @@ class ResponseGenerator:
         """
         # Record when this response generation started
         # Used to check if it was interrupted by a new user message
-        response_start_time = time.time()
+        response_start_time = time.monotonic_ns()
 
         # Generate unique task ID for interruption tracking
         task_id = TaskIdentifier(room_id=orch_context.room_id, agent_id=agent.id)
 
-        # Fetch room to get created_at timestamp (use cache for performance)
-        room = await crud.get_room_cached(orch_context.db, orch_context.room_id)
+        # Reuse the room the tape executor fetched for this cell; otherwise fetch it (use cache for performance)
+        room = orch_context.room
+        if room is None:
+            room = await crud.get_room_cached(orch_context.db, orch_context.room_id)
 
         # Fetch only the messages since this agent's last response (cache for performance)
         room_messages = await crud.get_messages_after_agent_response_cached(
@@ -103,6 +105,7 @@ class ResponseGenerator:
             agent_name=agent.name,
             agent_count=agent_count,
             user_name=user_name,
+            room_id=orch_context.room_id,
         )
 
         # For follow-up rounds, skip if there are no new messages since this agent's last response
@@ -268,13 +271,13 @@ class ResponseGenerator:
 
         return bool(actual_messages)
 
-    def _was_interrupted(self, room_id: int, response_start_time: float, agent_name: str) -> bool:
+    def _was_interrupted(self, room_id: int, response_start_time: int, agent_name: str) -> bool:
         """
         Check if this response was interrupted by a new user message.
 
         Args:
             room_id: Room ID
-            response_start_time: When this response generation started
+            response_start_time: When this response generation started (time.monotonic_ns())
             agent_name: Name of the agent (for logging)
 
         Returns:
@@ -285,7 +288,7 @@ class ResponseGenerator:
             if last_user_msg_time > response_start_time:
                 logger.info(
                     f"⏭️  SKIPPING BROADCAST | Room: {room_id} | Agent: {agent_name} | "
-                    f"Response started at {response_start_time:.3f}, but interrupted by user message at {last_user_msg_time:.3f}"
+                    f"Interrupted by user message {(last_user_msg_time - response_start_time) / 1e6:.1f}ms after response started"
                 )
                 return True
         return False
@@ -45,6 +45,9 @@ class TapeExecutor:
         self.response_generator = response_generator
         self.agents_by_id = agents_by_id
         self.max_total_messages = max_total_messages
+        # Agent message count for room.max_interactions, seeded from the DB on first use
+        # and then advanced by the responses this executor produces
+        self._agent_message_count: Optional[int] = None
 
     async def execute(
         self,
@@ -86,7 +89,9 @@ class TapeExecutor:
 
             # ===== SINGLE LIMIT CHECK (room.max_interactions) =====
             if room and room.max_interactions is not None:
-                current_count = await self._count_agent_messages(orch_context.db, orch_context.room_id)
+                if self._agent_message_count is None:
+                    self._agent_message_count = await self._count_agent_messages(orch_context.db, orch_context.room_id)
+                current_count = self._agent_message_count
                 if current_count >= room.max_interactions:
                     logger.info(
                         f"🛑 Room interaction limit reached | Room: {orch_context.room_id} | "
@@ -100,18 +105,23 @@ class TapeExecutor:
             if cell is None:
                 break
 
-            # Execute current cell
+            # Execute current cell (sharing the room fetched above with response generation)
+            orch_context.room = room
             try:
                 cell_result = await self._execute_cell(cell, orch_context, user_message_content)
                 result.total_responses += cell_result["responses"]
                 result.total_skips += cell_result["skips"]
                 running_total += cell_result["responses"]
+                if self._agent_message_count is not None:
+                    self._agent_message_count += cell_result["responses"]
 
             except asyncio.CancelledError:
                 logger.info(f"⏹️  Tape interrupted | Room: {orch_context.room_id}")
                 result.was_interrupted = True
                 tape.cut_at_current()
                 raise
+            finally:
+                orch_context.room = None
 
             # Advance to next cell
             tape.advance()
@@ -241,14 +251,4 @@ class TapeExecutor:
 
     async def _count_agent_messages(self, db, room_id: int) -> int:
         """Count agent messages in room."""
-        import models
-        from sqlalchemy import func
-        from sqlalchemy.future import select
-
-        result = await db.execute(
-            select(func.count(models.Message.id)).where(
-                models.Message.room_id == room_id,
-                models.Message.role == "assistant",
-            )
-        )
-        return result.scalar() or 0
+        return await crud.count_agent_messages(db, room_id)
@@ -7,7 +7,9 @@ weaving in interrupt agents appropriately.
 
 import logging
 import random
-from typing import List, Tuple
+from typing import List
+
+from orchestration.agent_ordering import separate_priority_agents
 
 from .models import CellType, TurnCell, TurnTape
 
@@ -36,8 +38,9 @@ class TapeGenerator:
         self.agents = agents
         self.interrupt_agents = interrupt_agents
 
-        # Pre-sort agents
-        self.priority_agents, self.regular_agents = self._separate_priority(agents)
+        # Pre-sort agents once; every round's tape reuses this ordering
+        self.priority_agents, self.regular_agents = separate_priority_agents(agents)
+        self._interrupt_agent_ids = [a.id for a in interrupt_agents]
 
         # Log configuration
         if self.priority_agents:
@@ -48,22 +51,6 @@ class TapeGenerator:
         if self.interrupt_agents:
             logger.debug(f"Interrupt agents: {[a.name for a in self.interrupt_agents]}")
 
-    def _separate_priority(self, agents: List) -> Tuple[List, List]:
-        """Separate and sort priority vs regular agents."""
-        priority = []
-        regular = []
-
-        for agent in agents:
-            if getattr(agent, "priority", 0) > 0:
-                priority.append(agent)
-            else:
-                regular.append(agent)
-
-        # Sort by priority descending (higher priority first)
-        priority.sort(key=lambda a: getattr(a, "priority", 0), reverse=True)
-
-        return priority, regular
-
     def _is_transparent(self, agent) -> bool:
         """Check if agent is transparent (doesn't trigger interrupt agents)."""
         return getattr(agent, "transparent", 0) == 1
@@ -76,7 +63,7 @@ class TapeGenerator:
             triggering_agent_id: Agent that triggered this interrupt (for logging)
             exclude_agent_id: Agent ID to exclude (for self-interruption prevention)
         """
-        agent_ids = [a.id for a in self.interrupt_agents if a.id != exclude_agent_id]
+        agent_ids = [agent_id for agent_id in self._interrupt_agent_ids if agent_id != exclude_agent_id]
         return TurnCell(
             cell_type=CellType.INTERRUPT,
             agent_ids=agent_ids,
@@ -99,7 +86,7 @@ class TapeGenerator:
             tape.cells.append(
                 TurnCell(
                     cell_type=CellType.INTERRUPT,
-                    agent_ids=[a.id for a in self.interrupt_agents],
+                    agent_ids=list(self._interrupt_agent_ids),
                     triggering_agent_id=None,  # Triggered by user
                 )
             )
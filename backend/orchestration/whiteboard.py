@@ -128,7 +128,7 @@ def create_empty_whiteboard() -> WhiteboardState:
     return WhiteboardState(lines=[])
 
 
-def process_messages_for_whiteboard(messages: List) -> dict:
+def process_messages_for_whiteboard(messages: List, render_from: int = 0) -> dict:
     """
     Process messages and return a map of message_id -> rendered_content
     for whiteboard messages.
@@ -137,6 +137,9 @@ def process_messages_for_whiteboard(messages: List) -> dict:
 
     Args:
         messages: List of message objects with content and agent attributes
+        render_from: Index of the first message to render. Diffs before it are
+            still applied to the state but not rendered, since callers that only
+            show a recent window never look them up.
 
     Returns:
         Dict mapping message_id to rendered whiteboard content
@@ -144,7 +147,7 @@ def process_messages_for_whiteboard(messages: List) -> dict:
     rendered_map = {}
     state = create_empty_whiteboard()
 
-    for msg in messages:
+    for index, msg in enumerate(messages):
         # Check if this is a message from the whiteboard agent
         agent_name = getattr(msg, "agent", None)
         if agent_name:
@@ -164,8 +167,9 @@ def process_messages_for_whiteboard(messages: List) -> dict:
                 state = apply_diff(state, operations)
 
             # Store the rendered content for this message
-            rendered_map[msg.id] = render_whiteboard(state)
-        else:
+            if index >= render_from:
+                rendered_map[msg.id] = render_whiteboard(state)
+        elif index >= render_from:
             # Not a diff format - might be old full-content format
             rendered_map[msg.id] = content
 
@@ -82,7 +82,7 @@ def create_action_tools(
             # Write directly to file if config_file is available
             if config_file:
                 timestamp = datetime.utcnow()
-                success = AgentConfigService.append_to_recent_events(
+                success = await AgentConfigService.append_to_recent_events_async(
                     config_file=config_file, memory_entry=validated_input.memory_entry, timestamp=timestamp
                 )
 
@@ -2,20 +2,129 @@
 Caching infrastructure for YAML configuration files.
 
 Provides file-based caching with automatic invalidation on file changes.
+
+On Linux (with inotify_simple installed), changes are detected by an inotify
+watch on each config file's parent directory, so cache hits need no stat()
+call. Elsewhere, or if a watch cannot be added, the file mtime is compared on
+every lookup instead.
 """
 
 import logging
+import mmap
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from infrastructure.locking import file_lock
 from ruamel.yaml import YAML
 
-yaml = YAML(typ="safe", pure=True)
+# Platform-specific imports
+try:
+    from inotify_simple import INotify
+    from inotify_simple import flags as inotify_flags
+
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
+# typ="safe" uses the libyaml-based C parser when ruamel.yaml.clib is installed
+# and falls back to the pure-Python parser otherwise
+yaml = YAML(typ="safe")
 logger = logging.getLogger(__name__)
 
 # Cache for loaded configurations: path -> (mtime, config)
 _config_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+_load_lock = threading.Lock()
+
+
+class _InotifyWatcher:
+    """
+    Tracks config files via inotify and records which ones changed on disk.
+
+    Parent directories are watched rather than the files themselves so that
+    editors and tools that replace a file by atomic rename are still caught.
+    A daemon thread drains events and marks the affected cache keys dirty.
+    """
+
+    _MASK = (
+        (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.DELETE | inotify_flags.DELETE_SELF)
+        if HAS_INOTIFY
+        else 0
+    )
+
+    def __init__(self):
+        self._inotify = INotify()
+        self._lock = threading.Lock()
+        # watch descriptor -> file name -> cache keys for that file
+        self._keys_by_dir: Dict[int, Dict[str, set[str]]] = {}
+        self._wd_by_key: Dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, file_path: Path) -> bool:
+        """
+        Start tracking a file and mark it clean; call before (re)loading it.
+
+        Returns:
+            True if the file is being watched, False if the caller must fall back to mtime checks
+        """
+        cache_key = str(file_path)
+        with self._lock:
+            if cache_key not in self._wd_by_key:
+                try:
+                    wd = self._inotify.add_watch(file_path.parent, self._MASK)
+                except OSError:
+                    return False
+                self._keys_by_dir.setdefault(wd, {}).setdefault(file_path.name, set()).add(cache_key)
+                self._wd_by_key[cache_key] = wd
+            self._dirty.discard(cache_key)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config-inotify", daemon=True)
+                self._thread.start()
+        return True
+
+    def is_fresh(self, cache_key: str) -> bool:
+        """Return True if the file is watched and has not changed since it was last tracked."""
+        return cache_key in self._wd_by_key and cache_key not in self._dirty
+
+    def _run(self):
+        while True:
+            events = self._inotify.read()
+            with self._lock:
+                for event in events:
+                    self._handle_event(event)
+
+    def _handle_event(self, event):
+        files = self._keys_by_dir.get(event.wd)
+        if files is None:
+            return
+
+        if event.mask & (inotify_flags.DELETE_SELF | inotify_flags.IGNORED):
+            # Directory is gone; drop the watch so the next lookup re-tracks or falls back
+            for keys in self._keys_by_dir.pop(event.wd).values():
+                for key in keys:
+                    self._wd_by_key.pop(key, None)
+                    self._dirty.discard(key)
+            return
+
+        self._dirty.update(files.get(event.name, ()))
+
+
+_watcher: Optional[_InotifyWatcher] = None
+
+
+def _get_watcher() -> Optional[_InotifyWatcher]:
+    """Get the process-wide inotify watcher, creating it on first use (None if unavailable)."""
+    global _watcher
+    if _watcher is None and HAS_INOTIFY:
+        try:
+            _watcher = _InotifyWatcher()
+        except OSError as e:
+            logger.warning(f"inotify unavailable, falling back to mtime checks: {e}")
+            return None
+    return _watcher
 
 
 def _get_file_mtime(file_path: Path) -> float:
@@ -42,7 +151,12 @@ def _load_yaml_file(file_path: Path) -> Dict[str, Any]:
 
     try:
         with file_lock(str(file_path), "r") as f:
-            content = yaml.load(f)
+            # mmap(2) rejects empty files
+            if os.fstat(f.fileno()).st_size == 0:
+                return {}
+            # Parse straight from the page cache instead of copying the file into a str first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = yaml.load(mm)
             return content if content else {}
     except Exception as e:
         logger.error(f"Error loading YAML file {file_path}: {e}")
@@ -61,17 +175,39 @@ def get_cached_config(file_path: Path, force_reload: bool = False) -> Dict[str,
         Configuration dictionary
     """
     cache_key = str(file_path)
+    watcher = _get_watcher()
+
+    # Entries are read with a single .get() so a concurrent clear_cache() can't
+    # slip in between a membership test and the lookup
+    if not force_reload and watcher is not None:
+        cached = _config_cache.get(cache_key)
+        # Fast path: a watched file that hasn't changed needs no stat() call
+        if cached is not None and watcher.is_fresh(cache_key):
+            return cached[1]
+
+    # (Re)arm tracking before the stat so a write that races with the reload marks the entry dirty again
+    if watcher is not None:
+        watcher.track(file_path)
+
     current_mtime = _get_file_mtime(file_path)
 
     # Check if cache is valid
-    if not force_reload and cache_key in _config_cache:
-        cached_mtime, cached_config = _config_cache[cache_key]
-        if cached_mtime == current_mtime:
-            return cached_config
-
-    # Load fresh configuration
-    config = _load_yaml_file(file_path)
-    _config_cache[cache_key] = (current_mtime, config)
+    if not force_reload:
+        cached = _config_cache.get(cache_key)
+        if cached is not None and cached[0] == current_mtime:
+            return cached[1]
+
+    # Misses are serialized so concurrent callers don't all parse the same file;
+    # cache hits above never take the lock
+    with _load_lock:
+        if not force_reload:
+            cached = _config_cache.get(cache_key)
+            if cached is not None and cached[0] == current_mtime:
+                return cached[1]
+
+        # Load fresh configuration
+        config = _load_yaml_file(file_path)
+        _config_cache[cache_key] = (current_mtime, config)
 
     logger.debug(f"Loaded configuration from {file_path}")
     return config
@@ -6,8 +6,10 @@ Provides functions to load specific configuration files with caching.
 
 import logging
 import os
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, Optional
 
 from .cache import get_cached_config
 
@@ -82,25 +84,45 @@ def get_guidelines_config() -> Dict[str, Any]:
     return get_cached_config(get_guidelines_config_path())
 
 
-def get_debug_config() -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def _get_debug_agents_override() -> Optional[bool]:
+    """
+    Read the DEBUG_AGENTS override once from the process environment.
+
+    Only the process environment is consulted, not .env, so the DEBUG_AGENTS=false
+    shipped in .env.example cannot silently disable debug.yaml.
+
+    Returns:
+        True or False for an explicit "true"/"false" (any case), None otherwise
+    """
+    debug_env = os.environ.get("DEBUG_AGENTS", "").lower()
+    if debug_env in ("true", "false"):
+        return debug_env == "true"
+    return None
+
+
+def get_debug_config() -> Mapping[str, Any]:
     """
     Load the debug configuration from debug.yaml with environment variable overrides.
 
     Environment variables take precedence:
-    - DEBUG_AGENTS=true overrides debug.enabled
+    - DEBUG_AGENTS=true/false overrides debug.enabled; any other value is ignored
+
+    The override is layered over the cached config with ChainMap so the shared
+    cache entry is never mutated.
 
     Returns:
-        Dictionary containing debug settings
+        Mapping containing debug settings (shared; callers must not modify it)
     """
     from core import get_settings
 
     config = get_cached_config(get_settings().debug_config_path)
 
-    # Apply environment variable overrides
-    if "debug" in config:
-        debug_env = os.getenv("DEBUG_AGENTS", "").lower()
-        if debug_env in ("true", "false"):
-            config["debug"]["enabled"] = debug_env == "true"
+    # Apply environment variable overrides (only an explicit true/false)
+    override = _get_debug_agents_override()
+    if "debug" in config and override is not None:
+        debug_section = ChainMap({"enabled": override}, config["debug"])
+        return ChainMap({"debug": debug_section}, config)
 
     return config
 
@@ -5,7 +5,9 @@ Provides functions to get tool descriptions, schemas, and groupings.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Callable, Dict, Optional
 
 from .loaders import (
     get_conversation_context_config,
@@ -18,10 +20,60 @@ from .loaders import (
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compile a str.format template into a render function once per distinct text.
+
+    Plain {name} fields are turned into generated f-string code, so repeated
+    renders skip format-string parsing entirely. Templates using anything
+    else (positional/attribute/index fields, conversions, format specs) fall
+    back to str.format.
+    """
+    body = []
+    fields: Dict[str, str] = {}
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        body.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or format_spec or conversion:
+            return lambda values: template.format(**values)
+        # Generated locals (_0, _1, ...) can't clash with keywords or the values parameter
+        local = fields.setdefault(field_name, f"_{len(fields)}")
+        body.append("{" + local + "}")
+
+    lines = ["def _render(values):"]
+    lines += [f"    {local} = values[{name!r}]" for name, local in fields.items()]
+    lines.append(f"    return f{''.join(body)!r}")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), f"<template {template[:40]!r}>", "exec"), namespace)
+    return namespace["_render"]
+
+
+def _render_template(template: str, **values: Any) -> str:
+    """
+    Render a template with the same result as template.format(**values).
+
+    Raises:
+        KeyError: If the template references a name not in values
+    """
+    return _compile_template(template)(values)
+
+
+# group_name -> (base_config, group_config, merged). The source dicts are the cached
+# objects returned by the loaders, so an identity match means neither file has been
+# reloaded and the merged copy is still current.
+_merged_tools_configs: Dict[str, tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = {}
+
+
 def _get_tools_config_for_group(group_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Get tools configuration with group-specific overrides applied.
 
+    The merged configuration is built once per group and reused until either
+    source file is reloaded; callers must treat it as read-only.
+
     Args:
         group_name: Optional group name to apply group-specific overrides
 
@@ -35,10 +87,16 @@ def _get_tools_config_for_group(group_name: Optional[str] = None) -> Dict[str, A
 
     # Load and merge group config
     group_config = get_group_config(group_name)
-    if group_config:
-        return merge_tool_configs(base_config, group_config)
+    if not group_config:
+        return base_config
+
+    cached = _merged_tools_configs.get(group_name)
+    if cached is not None and cached[0] is base_config and cached[1] is group_config:
+        return cached[2]
 
-    return base_config
+    merged = merge_tool_configs(base_config, group_config)
+    _merged_tools_configs[group_name] = (base_config, group_config, merged)
+    return merged
 
 
 def get_tool_description(
@@ -71,7 +129,7 @@ def get_tool_description(
         template = guidelines_config.get(active_version, {}).get("template", "")
 
         # Substitute template variables
-        description = template.format(agent_name=agent_name, situation_builder_note=situation_builder_note)
+        description = _render_template(template, agent_name=agent_name, situation_builder_note=situation_builder_note)
         return description
 
     # For other tools, load from tools.yaml (with optional group overrides)
@@ -92,7 +150,8 @@ def get_tool_description(
     description = tool_config.get("description", "")
 
     # Substitute template variables
-    description = description.format(
+    description = _render_template(
+        description,
         agent_name=agent_name,
         config_sections=config_sections,
         situation_builder_note=situation_builder_note,
@@ -122,7 +181,7 @@ def get_tool_response(tool_name: str, group_name: Optional[str] = None, **kwargs
     response_template = tools_config["tools"][tool_name].get("response", "")
 
     try:
-        return response_template.format(**kwargs)
+        return _render_template(response_template, **kwargs)
     except KeyError as e:
         logger.warning(f"Missing variable in tool response template: {e}")
         return response_template
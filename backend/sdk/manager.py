@@ -45,6 +45,8 @@ class AgentManager:
         # 2. Use Claude Code web authentication (when running through Claude Code with subscription)
         # If CLAUDE_API_KEY is not set, the SDK will use Claude Code authentication.
         self.active_clients: dict[TaskIdentifier, ClaudeSDKClient] = {}
+        # Secondary index of active_clients: room_id -> agent IDs currently generating in that room
+        self.clients_by_room: dict[int, set[int]] = {}
         # Client pool for managing SDK client lifecycle
         self.client_pool = ClientPool()
         # Stream parser for SDK message parsing
@@ -52,6 +54,20 @@ class AgentManager:
         # Streaming state: tracks current thinking text per task during generation
         self.streaming_state: dict[TaskIdentifier, dict] = {}
 
+    def _register_client(self, task_id: TaskIdentifier, client: ClaudeSDKClient):
+        """Track a client as active and index it under its room."""
+        self.active_clients[task_id] = client
+        self.clients_by_room.setdefault(task_id.room_id, set()).add(task_id.agent_id)
+
+    def _unregister_client(self, task_id: TaskIdentifier):
+        """Stop tracking a client and drop it from the room index."""
+        self.active_clients.pop(task_id, None)
+        room_agents = self.clients_by_room.get(task_id.room_id)
+        if room_agents is not None:
+            room_agents.discard(task_id.agent_id)
+            if not room_agents:
+                del self.clients_by_room[task_id.room_id]
+
     async def interrupt_all(self):
         """Interrupt all currently active agent responses."""
         logger.info(f"🛑 Interrupting {len(self.active_clients)} active agent(s)")
@@ -63,6 +79,7 @@ class AgentManager:
                 logger.warning(f"Failed to interrupt task {task_id}: {e}")
         # Clear the active clients after interruption
         self.active_clients.clear()
+        self.clients_by_room.clear()
 
     async def shutdown(self):
         """
@@ -86,7 +103,7 @@ class AgentManager:
                 if client:
                     await client.interrupt()
                     logger.debug(f"Interrupted task: {task_id}")
-                    del self.active_clients[task_id]
+                    self._unregister_client(task_id)
             except Exception as e:
                 logger.warning(f"Failed to interrupt task {task_id}: {e}")
 
@@ -200,10 +217,12 @@ class AgentManager:
                 # Content blocks with potential inline images
                 content_blocks = context.user_message
                 if context.conversation_history:
-                    # Prepend conversation history to first text block
-                    for block in content_blocks:
+                    # Prepend conversation history to first text block. Build a new list rather than
+                    # editing in place: the blocks may be shared with the conversation context cache.
+                    content_blocks = list(content_blocks)
+                    for i, block in enumerate(content_blocks):
                         if block.get("type") == "text":
-                            block["text"] = f"{context.conversation_history}\n\n{block['text']}"
+                            content_blocks[i] = {**block, "text": f"{context.conversation_history}\n\n{block['text']}"}
                             break
                 message_to_send = content_blocks
             else:
@@ -218,7 +237,7 @@ class AgentManager:
             client, _ = await self.client_pool.get_or_create(pool_key, options)
 
             # Register this client for interruption support
-            self.active_clients[task_id] = client
+            self._register_client(task_id, client)
             logger.debug(f"Registered client for task: {task_id}")
 
             # Initialize streaming state for this task
@@ -351,7 +370,7 @@ class AgentManager:
 
             # Unregister the client when done
             if context.task_id and context.task_id in self.active_clients:
-                del self.active_clients[context.task_id]
+                self._unregister_client(context.task_id)
                 logger.debug(f"Unregistered client for task: {context.task_id}")
 
             # Clean up streaming state
@@ -397,7 +416,7 @@ class AgentManager:
             # Task was cancelled due to interruption - this is expected
             # Clean up client from active_clients (but keep it in pool for reuse)
             if context.task_id and context.task_id in self.active_clients:
-                del self.active_clients[context.task_id]
+                self._unregister_client(context.task_id)
                 logger.debug(f"Unregistered client for task (interrupted): {context.task_id}")
 
             # Clean up streaming state
@@ -420,7 +439,7 @@ class AgentManager:
         except Exception as e:
             # Clean up client on error
             if context.task_id and context.task_id in self.active_clients:
-                del self.active_clients[context.task_id]
+                self._unregister_client(context.task_id)
                 logger.debug(f"Unregistered client for task (error cleanup): {context.task_id}")
 
             # Clean up streaming state
@@ -5,6 +5,7 @@ This service separates file I/O operations from database CRUD operations,
 providing a cleaner separation of concerns and making the code more testable.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,64 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("AgentConfigService")
 
+# Maximum number of queued appends drained into a single writer batch
+_RECENT_EVENTS_BATCH_SIZE = 64
+
+# Background writer state for append_to_recent_events_async (bound to one event loop)
+_recent_events_queue: asyncio.Queue | None = None
+_recent_events_writer: asyncio.Task | None = None
+
+
+def _get_recent_events_queue() -> asyncio.Queue:
+    """Return the recent_events write queue, starting the writer task if needed."""
+    global _recent_events_queue, _recent_events_writer
+
+    loop = asyncio.get_running_loop()
+    if _recent_events_writer is None or _recent_events_writer.done() or _recent_events_writer.get_loop() is not loop:
+        _recent_events_queue = asyncio.Queue()
+        _recent_events_writer = loop.create_task(_recent_events_writer_loop(_recent_events_queue))
+    return _recent_events_queue
+
+
+async def _recent_events_writer_loop(queue: asyncio.Queue):
+    """
+    Drain queued recent_events appends, grouping them by file.
+
+    Each file gets one open/lock/write/close per batch, executed in a worker
+    thread so fcntl and disk I/O never block the event loop.
+
+    If the writer is cancelled or dies, every dequeued or still-queued append
+    is resolved as failed so no caller is left awaiting forever.
+    """
+    batch: list[tuple[Path, str, asyncio.Future]] = []
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _RECENT_EVENTS_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            by_file: dict[Path, list[tuple[str, asyncio.Future]]] = {}
+            for recent_events_file, entry, future in batch:
+                by_file.setdefault(recent_events_file, []).append((entry, future))
+
+            for recent_events_file, items in by_file.items():
+                try:
+                    success = await asyncio.to_thread(
+                        AgentConfigService._write_recent_events, recent_events_file, [entry for entry, _ in items]
+                    )
+                except Exception as e:
+                    logger.error(f"Error: Could not update recent_events file: {e}")
+                    success = False
+                for _, future in items:
+                    if not future.done():
+                        future.set_result(success)
+    finally:
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(False)
+
 
 class AgentConfigService:
     """
@@ -31,20 +90,17 @@ class AgentConfigService:
         return backend_dir.parent
 
     @staticmethod
-    def append_to_recent_events(config_file: str, memory_entry: str, timestamp: Optional[datetime] = None) -> bool:
+    def _resolve_recent_events(
+        config_file: str, memory_entry: str, timestamp: Optional[datetime] = None
+    ) -> Optional[tuple[Path, str]]:
         """
-        Append a memory entry to the agent's recent_events.md file.
-
-        Args:
-            config_file: Path to the agent's config file (relative to project root)
-            memory_entry: One-liner memory to append
-            timestamp: Optional timestamp (defaults to now)
+        Resolve the recent_events.md path and format the entry to append.
 
         Returns:
-            True if successful, False otherwise
+            (recent_events_file, formatted_entry) or None if the config is invalid
         """
         if not config_file:
-            return False
+            return None
 
         if timestamp is None:
             timestamp = datetime.utcnow()
@@ -58,27 +114,33 @@ class AgentConfigService:
         # Check if it's a folder-based config
         if not config_path.is_dir():
             logger.warning(f"Warning: Config path {config_path} is not a directory")
-            return False
+            return None
 
-        recent_events_file = config_path / "recent_events.md"
+        return config_path / "recent_events.md", formatted_entry
 
+    @staticmethod
+    def _write_recent_events(recent_events_file: Path, entries: list[str]) -> bool:
+        """
+        Append one or more formatted entries to a recent_events.md file
+        under a single file lock.
+        """
         try:
             # Use file locking to prevent race conditions
             # Mode 'a' for simple append - just add new line at end
             with file_lock(str(recent_events_file), "a") as f:
                 # Append with double newline for better readability
                 # file_lock ensures the file exists and handle is at end
-                f.write("\n" + formatted_entry + "\n")
+                f.write("".join("\n" + entry + "\n" for entry in entries))
 
-            logger.debug(f"Appended memory entry to {recent_events_file}")
+            logger.debug(f"Appended {len(entries)} memory entries to {recent_events_file}")
             return True
 
         except FileNotFoundError:
-            # File doesn't exist, create it with the entry (no leading newline for first entry)
+            # File doesn't exist, create it with the entries (no leading newline for first entry)
             try:
                 with file_lock(str(recent_events_file), "w") as f:
-                    f.write(formatted_entry + "\n")
-                logger.debug(f"Created {recent_events_file} with memory entry")
+                    f.write(entries[0] + "\n" + "".join("\n" + entry + "\n" for entry in entries[1:]))
+                logger.debug(f"Created {recent_events_file} with memory entries")
                 return True
             except Exception as e:
                 logger.error(f"Error: Could not create recent_events file: {e}")
@@ -87,6 +149,55 @@ class AgentConfigService:
             logger.error(f"Error: Could not update recent_events file: {e}")
             return False
 
+    @staticmethod
+    def append_to_recent_events(config_file: str, memory_entry: str, timestamp: Optional[datetime] = None) -> bool:
+        """
+        Append a memory entry to the agent's recent_events.md file.
+
+        Blocking variant; async callers should use append_to_recent_events_async.
+
+        Args:
+            config_file: Path to the agent's config file (relative to project root)
+            memory_entry: One-liner memory to append
+            timestamp: Optional timestamp (defaults to now)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        resolved = AgentConfigService._resolve_recent_events(config_file, memory_entry, timestamp)
+        if resolved is None:
+            return False
+
+        recent_events_file, formatted_entry = resolved
+        return AgentConfigService._write_recent_events(recent_events_file, [formatted_entry])
+
+    @staticmethod
+    async def append_to_recent_events_async(
+        config_file: str, memory_entry: str, timestamp: Optional[datetime] = None
+    ) -> bool:
+        """
+        Append a memory entry to the agent's recent_events.md file without blocking the event loop.
+
+        The entry is handed to a background writer that coalesces concurrent appends
+        to the same file into one locked write performed off the event loop.
+
+        Args:
+            config_file: Path to the agent's config file (relative to project root)
+            memory_entry: One-liner memory to append
+            timestamp: Optional timestamp (defaults to now)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        resolved = AgentConfigService._resolve_recent_events(config_file, memory_entry, timestamp)
+        if resolved is None:
+            return False
+
+        recent_events_file, formatted_entry = resolved
+        future = asyncio.get_running_loop().create_future()
+        _get_recent_events_queue().put_nowait((recent_events_file, formatted_entry, future))
+        return await future
+
     @staticmethod
     def load_agent_config(config_file: str) -> Optional["AgentConfigData"]:
         """
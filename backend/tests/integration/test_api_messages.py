@@ -115,13 +115,11 @@ class TestMessagePolling:
         """Test polling with new messages."""
         client, token = authenticated_client
 
-        # Create initial message
-        await client.post(f"/rooms/{sample_room.id}/messages/send", json={"content": "First", "role": "user"})
-
-        # Get all messages to find last ID
-        response = await client.get(f"/rooms/{sample_room.id}/messages")
-        messages = response.json()
-        last_id = messages[-1]["id"] if messages else 0
+        # Create initial message; its ID is the polling cursor
+        response = await client.post(
+            f"/rooms/{sample_room.id}/messages/send", json={"content": "First", "role": "user"}
+        )
+        last_id = response.json()["id"]
 
         # Create new message
         await client.post(f"/rooms/{sample_room.id}/messages/send", json={"content": "Second", "role": "user"})
@@ -46,10 +46,10 @@ class TestRoomEndpoints:
         """Test listing all rooms."""
         client, token = authenticated_client
 
-        # Create multiple rooms
-        await client.post("/rooms", json={"name": "room1"})
-        await client.post("/rooms", json={"name": "room2"})
-        await client.post("/rooms", json={"name": "room3"})
+        # Create multiple rooms (sequentially: the client shares one database session)
+        for name in ("room1", "room2", "room3"):
+            response = await client.post("/rooms", json={"name": name})
+            assert response.status_code == 200
 
         # List rooms
         response = await client.get("/rooms")
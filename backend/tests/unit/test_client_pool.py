@@ -38,7 +38,6 @@ def mock_client():
     return client
 
 
-@pytest.mark.asyncio
 async def test_get_or_create_new_client(client_pool, mock_options):
     """Test creating a new client."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -57,7 +56,6 @@ async def test_get_or_create_new_client(client_pool, mock_options):
         mock_client.connect.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_get_or_create_reuse_existing(client_pool, mock_options):
     """Test reusing existing client."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -81,7 +79,6 @@ async def test_get_or_create_reuse_existing(client_pool, mock_options):
         assert mock_client.connect.call_count == 1
 
 
-@pytest.mark.asyncio
 async def test_session_change_triggers_new_client(client_pool):
     """Test that session change triggers new client creation."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -119,7 +116,6 @@ async def test_session_change_triggers_new_client(client_pool):
         # Note: disconnect is called in background task, so we can't easily assert it here
 
 
-@pytest.mark.asyncio
 async def test_cleanup_client(client_pool, mock_options):
     """Test cleanup removes client and schedules disconnect."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -147,7 +143,6 @@ async def test_cleanup_client(client_pool, mock_options):
         mock_client.disconnect.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_cleanup_nonexistent_client(client_pool):
     """Test cleanup of nonexistent client doesn't raise error."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -156,7 +151,6 @@ async def test_cleanup_nonexistent_client(client_pool):
     await client_pool.cleanup(task_id)
 
 
-@pytest.mark.asyncio
 async def test_cleanup_room(client_pool, mock_options):
     """Test cleanup all clients in a room."""
     task1 = TaskIdentifier(room_id=1, agent_id=1)
@@ -185,7 +179,6 @@ async def test_cleanup_room(client_pool, mock_options):
         assert task3 in client_pool.pool
 
 
-@pytest.mark.asyncio
 async def test_get_keys_for_agent(client_pool, mock_options):
     """Test filtering pool keys by agent_id."""
     task1 = TaskIdentifier(room_id=1, agent_id=5)
@@ -212,7 +205,6 @@ async def test_get_keys_for_agent(client_pool, mock_options):
         assert task3 not in keys
 
 
-@pytest.mark.asyncio
 async def test_shutdown_all(client_pool, mock_options):
     """Test shutdown waits for all cleanup tasks."""
     task1 = TaskIdentifier(room_id=1, agent_id=1)
@@ -238,7 +230,6 @@ async def test_shutdown_all(client_pool, mock_options):
         assert len(client_pool._cleanup_tasks) == 0
 
 
-@pytest.mark.asyncio
 async def test_concurrent_client_creation(client_pool, mock_options):
     """Test connection lock prevents race conditions."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -276,7 +267,6 @@ async def test_concurrent_client_creation(client_pool, mock_options):
         assert call_count == 1
 
 
-@pytest.mark.asyncio
 async def test_disconnect_client_background_with_disconnect_method(client_pool):
     """Test _disconnect_client_background uses disconnect method if available."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -288,7 +278,6 @@ async def test_disconnect_client_background_with_disconnect_method(client_pool):
     mock_client.disconnect.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_disconnect_client_background_with_close_method(client_pool):
     """Test _disconnect_client_background uses close method if disconnect not available."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -302,7 +291,6 @@ async def test_disconnect_client_background_with_close_method(client_pool):
     mock_client.close.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_disconnect_client_background_suppresses_cancel_errors(client_pool):
     """Test _disconnect_client_background suppresses cancel scope errors."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -313,7 +301,6 @@ async def test_disconnect_client_background_suppresses_cancel_errors(client_pool
     await client_pool._disconnect_client_background(mock_client, task_id)
 
 
-@pytest.mark.asyncio
 async def test_disconnect_client_background_logs_other_errors(client_pool):
     """Test _disconnect_client_background logs non-cancel errors."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -327,7 +314,6 @@ async def test_disconnect_client_background_logs_other_errors(client_pool):
         mock_logger.warning.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_retry_on_process_transport_error(client_pool, mock_options):
     """Test retry logic for ProcessTransport errors."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -356,7 +342,6 @@ async def test_retry_on_process_transport_error(client_pool, mock_options):
         assert mock_sdk_client_class.call_count == 3
 
 
-@pytest.mark.asyncio
 async def test_retry_exhausted_raises_error(client_pool, mock_options):
     """Test that retries exhausted raises the error."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -372,7 +357,6 @@ async def test_retry_exhausted_raises_error(client_pool, mock_options):
             await client_pool.get_or_create(task_id, mock_options)
 
 
-@pytest.mark.asyncio
 async def test_non_transport_error_raises_immediately(client_pool, mock_options):
     """Test that non-transport errors raise immediately without retry."""
     task_id = TaskIdentifier(room_id=1, agent_id=2)
@@ -390,7 +374,6 @@ async def test_non_transport_error_raises_immediately(client_pool, mock_options)
         assert mock_sdk_client_class.call_count == 1
 
 
-@pytest.mark.asyncio
 async def test_keys_method_returns_pool_keys(client_pool, mock_options):
     """Test that keys() method returns pool keys."""
     task1 = TaskIdentifier(room_id=1, agent_id=1)
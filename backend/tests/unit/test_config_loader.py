@@ -4,7 +4,9 @@ Unit tests for config loader module.
 Tests YAML configuration loading, caching, and hot-reloading.
 """
 
-import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import PropertyMock, patch
 
@@ -18,25 +20,75 @@ from sdk.config import (
     get_debug_config,
     get_tool_description,
 )
+from sdk.config import cache as cache_module
+from sdk.config import loaders as loaders_module
 
 # Alias for backward compatibility in tests
 _get_cached_config = get_cached_config
 
 
+@pytest.fixture
+def write_yaml(tmp_path):
+    """Write YAML text to a file in the test's tmp_path and return its path (pytest cleans it up)."""
+
+    def _write(text: str, name: str = "config.yaml") -> Path:
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    return _write
+
+
+# One file serving as tools, guidelines and debug config at once: each loader only
+# reads its own top-level keys, so the read-only tests below can share a single parse.
+_COMBINED_CONFIG = """\
+debug:
+  enabled: false
+tools:
+  test_tool:
+    enabled: true
+    description: 'Test {agent_name}'
+  disabled_tool:
+    enabled: false
+    description: 'Test description'
+  multi_var_tool:
+    enabled: true
+    description: '{agent_name} - {config_sections}'
+  guidelines:
+    enabled: true
+active_version: v1
+v1:
+  template: 'Guidelines for {agent_name}'
+"""
+
+
+@pytest.fixture(scope="module")
+def combined_config(tmp_path_factory):
+    """Write the shared combined config once per module and return its path."""
+    path = tmp_path_factory.mktemp("config") / "combined.yaml"
+    path.write_text(_COMBINED_CONFIG, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def combined_settings(combined_config):
+    """Point the tools and guidelines config paths at the shared combined config."""
+    with (
+        patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=combined_config),
+        patch.object(Settings, "guidelines_config_path", new_callable=PropertyMock, return_value=combined_config),
+    ):
+        yield combined_config
+
+
 class TestFileMtime:
     """Tests for _get_file_mtime function."""
 
     @pytest.mark.unit
-    def test_get_file_mtime_existing_file(self):
+    def test_get_file_mtime_existing_file(self, write_yaml):
         """Test getting modification time of existing file."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-            try:
-                mtime = _get_file_mtime(tmp_path)
-                assert mtime > 0
-                assert isinstance(mtime, float)
-            finally:
-                tmp_path.unlink()
+        mtime = _get_file_mtime(write_yaml(""))
+        assert mtime > 0
+        assert isinstance(mtime, float)
 
     @pytest.mark.unit
     def test_get_file_mtime_nonexistent_file(self):
@@ -49,30 +101,16 @@ class TestLoadYamlFile:
     """Tests for _load_yaml_file function."""
 
     @pytest.mark.unit
-    def test_load_yaml_file_valid(self):
+    def test_load_yaml_file_valid(self, write_yaml):
         """Test loading valid YAML file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("key: value\nnumber: 42\n")
-            tmp_path = Path(tmp.name)
-
-        try:
-            result = _load_yaml_file(tmp_path)
-            assert result == {"key": "value", "number": 42}
-        finally:
-            tmp_path.unlink()
+        result = _load_yaml_file(write_yaml("key: value\nnumber: 42\n"))
+        assert result == {"key": "value", "number": 42}
 
     @pytest.mark.unit
-    def test_load_yaml_file_empty(self):
+    def test_load_yaml_file_empty(self, write_yaml):
         """Test loading empty YAML file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("")
-            tmp_path = Path(tmp.name)
-
-        try:
-            result = _load_yaml_file(tmp_path)
-            assert result == {}
-        finally:
-            tmp_path.unlink()
+        result = _load_yaml_file(write_yaml(""))
+        assert result == {}
 
     @pytest.mark.unit
     def test_load_yaml_file_nonexistent(self):
@@ -81,17 +119,16 @@ class TestLoadYamlFile:
         assert result == {}
 
     @pytest.mark.unit
-    def test_load_yaml_file_nested_structure(self):
+    def test_load_yaml_file_nested_structure(self, write_yaml):
         """Test loading YAML file with nested structure."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("parent:\n  child1: value1\n  child2: value2\n")
-            tmp_path = Path(tmp.name)
+        result = _load_yaml_file(write_yaml("parent:\n  child1: value1\n  child2: value2\n"))
+        assert result == {"parent": {"child1": "value1", "child2": "value2"}}
 
-        try:
-            result = _load_yaml_file(tmp_path)
-            assert result == {"parent": {"child1": "value1", "child2": "value2"}}
-        finally:
-            tmp_path.unlink()
+    @pytest.mark.unit
+    def test_load_yaml_file_utf8_content(self, write_yaml):
+        """Test loading YAML file with non-ASCII (Korean) content."""
+        result = _load_yaml_file(write_yaml("name: 프리렌\nquote: |\n  안녕하세요\n  반가워요\n"))
+        assert result == {"name": "프리렌", "quote": "안녕하세요\n반가워요\n"}
 
 
 class TestCachedConfig:
@@ -102,131 +139,194 @@ class TestCachedConfig:
         _config_cache.clear()
 
     @pytest.mark.unit
-    def test_get_cached_config_first_load(self):
+    def test_get_cached_config_first_load(self, write_yaml):
         """Test loading config for the first time (cache miss)."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("test: value\n")
-            tmp_path = Path(tmp.name)
+        config_path = write_yaml("test: value\n")
 
-        try:
-            result = _get_cached_config(tmp_path)
-            assert result == {"test": "value"}
-            assert str(tmp_path) in _config_cache
-        finally:
-            tmp_path.unlink()
+        result = _get_cached_config(config_path)
+        assert result == {"test": "value"}
+        assert str(config_path) in _config_cache
 
     @pytest.mark.unit
-    def test_get_cached_config_cache_hit(self):
+    def test_get_cached_config_cache_hit(self, write_yaml):
         """Test loading config from cache (cache hit)."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("test: value\n")
-            tmp_path = Path(tmp.name)
+        config_path = write_yaml("test: value\n")
 
-        try:
-            # First load
-            result1 = _get_cached_config(tmp_path)
-            # Second load (should hit cache)
-            result2 = _get_cached_config(tmp_path)
+        # First load
+        result1 = _get_cached_config(config_path)
+        # Second load (should hit cache)
+        result2 = _get_cached_config(config_path)
 
-            assert result1 == result2
-            assert result2 == {"test": "value"}
-        finally:
-            tmp_path.unlink()
+        assert result1 == result2
+        assert result2 == {"test": "value"}
 
     @pytest.mark.unit
-    def test_get_cached_config_force_reload(self):
+    def test_get_cached_config_force_reload(self, write_yaml):
         """Test force reloading config bypasses cache."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("test: value1\n")
-            tmp_path = Path(tmp.name)
+        config_path = write_yaml("test: value1\n")
+
+        # First load
+        result1 = _get_cached_config(config_path)
+        assert result1 == {"test": "value1"}
+
+        # Modify file
+        write_yaml("test: value2\n")
 
-        try:
-            # First load
-            result1 = _get_cached_config(tmp_path)
-            assert result1 == {"test": "value1"}
+        # Force reload
+        result2 = _get_cached_config(config_path, force_reload=True)
+        assert result2 == {"test": "value2"}
 
-            # Modify file
-            with open(tmp_path, "w") as f:
-                f.write("test: value2\n")
+    @pytest.mark.unit
+    @pytest.mark.parametrize("use_watcher", [True, False], ids=["inotify", "mtime"])
+    def test_get_cached_config_reloads_changed_file(self, write_yaml, monkeypatch, use_watcher):
+        """Test that an on-disk change is picked up without force_reload."""
+        if use_watcher and not cache_module.HAS_INOTIFY:
+            pytest.skip("inotify_simple not available")
+        if not use_watcher:
+            monkeypatch.setattr(cache_module, "_get_watcher", lambda: None)
+
+        config_path = write_yaml("test: value1\n")
+        assert _get_cached_config(config_path) == {"test": "value1"}
+
+        write_yaml("test: value2\n")
+
+        # The watcher thread marks the entry dirty asynchronously
+        deadline = time.monotonic() + 2
+        while _get_cached_config(config_path) != {"test": "value2"} and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _get_cached_config(config_path) == {"test": "value2"}
+
+    @pytest.mark.unit
+    def test_get_cached_config_concurrent_miss_loads_once(self, write_yaml, monkeypatch):
+        """Test that threads missing the cache together parse the file only once."""
+        config_path = write_yaml("test: value\n")
+
+        calls = []
+        barrier = threading.Barrier(8)
+        real_load = cache_module._load_yaml_file
 
-            # Force reload
-            result2 = _get_cached_config(tmp_path, force_reload=True)
-            assert result2 == {"test": "value2"}
-        finally:
-            tmp_path.unlink()
+        def slow_load(file_path):
+            calls.append(file_path)
+            time.sleep(0.05)
+            return real_load(file_path)
+
+        monkeypatch.setattr(cache_module, "_load_yaml_file", slow_load)
+
+        def worker():
+            barrier.wait()
+            return _get_cached_config(config_path)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: worker(), range(8)))
+
+        assert results == [{"test": "value"}] * 8
+        assert len(calls) == 1
 
 
 class TestGetDebugConfig:
     """Tests for get_debug_config function."""
 
     def setup_method(self):
-        """Clear cache before each test."""
+        """Clear caches before each test."""
         _config_cache.clear()
+        loaders_module._get_debug_agents_override.cache_clear()
         reset_settings()
 
     def teardown_method(self):
-        """Reset settings after each test."""
+        """Reset settings and the cached DEBUG_AGENTS override after each test."""
+        loaders_module._get_debug_agents_override.cache_clear()
         reset_settings()
 
     @pytest.mark.unit
-    def test_get_debug_config_env_override_true(self, monkeypatch):
+    def test_get_debug_config_env_override_true(self, combined_config, monkeypatch):
         """Test DEBUG_AGENTS environment variable overrides config."""
-        # Create a temporary debug config
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("debug:\n  enabled: false\n")
-            tmp_path = Path(tmp.name)
-
-        try:
-            # Set environment variable
-            monkeypatch.setenv("DEBUG_AGENTS", "true")
-
-            # Patch the settings property
-            with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                config = get_debug_config()
-                assert config["debug"]["enabled"] is True
-        finally:
-            tmp_path.unlink()
+        # Set environment variable (the combined config has debug.enabled: false)
+        monkeypatch.setenv("DEBUG_AGENTS", "true")
+
+        # Patch the settings property
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=combined_config):
+            config = get_debug_config()
+            assert config["debug"]["enabled"] is True
 
     @pytest.mark.unit
-    def test_get_debug_config_env_override_false(self, monkeypatch):
+    def test_get_debug_config_override_leaves_cache_untouched(self, write_yaml, monkeypatch):
+        """Test the env override is layered on top of, not written into, the cached config."""
+        config_path = write_yaml("debug:\n  enabled: false\n  logging:\n    level: info\n")
+        monkeypatch.setenv("DEBUG_AGENTS", "true")
+
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            config = get_debug_config()
+
+        assert config["debug"]["enabled"] is True
+        assert config["debug"]["logging"] == {"level": "info"}
+        assert _get_cached_config(config_path)["debug"]["enabled"] is False
+
+    @pytest.mark.unit
+    def test_get_debug_config_env_override_false(self, write_yaml, monkeypatch):
         """Test DEBUG_AGENTS=false overrides config."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("debug:\n  enabled: true\n")
-            tmp_path = Path(tmp.name)
+        config_path = write_yaml("debug:\n  enabled: true\n")
 
-        try:
-            monkeypatch.setenv("DEBUG_AGENTS", "false")
+        monkeypatch.setenv("DEBUG_AGENTS", "false")
 
-            with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                config = get_debug_config()
-                assert config["debug"]["enabled"] is False
-        finally:
-            tmp_path.unlink()
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            config = get_debug_config()
+            assert config["debug"]["enabled"] is False
 
     @pytest.mark.unit
-    def test_get_debug_config_no_env_override(self, monkeypatch):
+    def test_get_debug_config_no_env_override(self, write_yaml, monkeypatch):
         """Test config is used when no environment variable is set."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("debug:\n  enabled: true\n")
-            tmp_path = Path(tmp.name)
+        config_path = write_yaml("debug:\n  enabled: true\n")
+
+        # Make sure env var is not set
+        monkeypatch.delenv("DEBUG_AGENTS", raising=False)
+
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            config = get_debug_config()
+            assert config["debug"]["enabled"] is True
+
+    @pytest.mark.unit
+    def test_get_debug_config_reads_env_once(self, write_yaml, monkeypatch):
+        """Test DEBUG_AGENTS is read on the first call and reused afterwards."""
+        config_path = write_yaml("debug:\n  enabled: false\n")
+        monkeypatch.setenv("DEBUG_AGENTS", "true")
+
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            assert get_debug_config()["debug"]["enabled"] is True
+            monkeypatch.setenv("DEBUG_AGENTS", "false")
+            assert get_debug_config()["debug"]["enabled"] is True
+
+    @pytest.mark.unit
+    def test_get_debug_config_ignores_dotenv_debug_agents(self, write_yaml, tmp_path, monkeypatch):
+        """Test DEBUG_AGENTS from a .env file does not override debug.yaml."""
+        config_path = write_yaml("debug:\n  enabled: true\n")
+        env_dir = tmp_path / "envdir"
+        env_dir.mkdir()
+        (env_dir / ".env").write_text("DEBUG_AGENTS=false\n")
+        monkeypatch.chdir(env_dir)
+        monkeypatch.delenv("DEBUG_AGENTS", raising=False)
+        reset_settings()
 
-        try:
-            # Make sure env var is not set
-            monkeypatch.delenv("DEBUG_AGENTS", raising=False)
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            config = get_debug_config()
+            assert config["debug"]["enabled"] is True
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value", ["", "yes", "0"])
+    def test_get_debug_config_ignores_invalid_env_value(self, write_yaml, monkeypatch, value):
+        """Test DEBUG_AGENTS values other than true/false leave the config untouched."""
+        config_path = write_yaml("debug:\n  enabled: true\n")
+        monkeypatch.setenv("DEBUG_AGENTS", value)
 
-            with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                config = get_debug_config()
-                assert config["debug"]["enabled"] is True
-        finally:
-            tmp_path.unlink()
+        with patch.object(Settings, "debug_config_path", new_callable=PropertyMock, return_value=config_path):
+            config = get_debug_config()
+            assert config["debug"]["enabled"] is True
 
 
 class TestGetToolDescription:
     """Tests for get_tool_description function."""
 
     def setup_method(self):
-        """Clear cache before each test."""
-        _config_cache.clear()
+        """Reset settings before each test (the config cache is left warm for the shared file)."""
         reset_settings()
 
     def teardown_method(self):
@@ -234,83 +334,67 @@ class TestGetToolDescription:
         reset_settings()
 
     @pytest.mark.unit
-    def test_get_tool_description_basic(self):
+    def test_get_tool_description_basic(self, combined_settings):
         """Test getting basic tool description."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("tools:\n  test_tool:\n    enabled: true\n    description: 'Test {agent_name}'\n")
-            tmp_path = Path(tmp.name)
-
-        try:
-            with patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                desc = get_tool_description("test_tool", agent_name="Alice")
-                assert desc == "Test Alice"
-        finally:
-            tmp_path.unlink()
+        desc = get_tool_description("test_tool", agent_name="Alice")
+        assert desc == "Test Alice"
 
     @pytest.mark.unit
-    def test_get_tool_description_disabled_tool(self):
+    def test_get_tool_description_disabled_tool(self, combined_settings):
         """Test getting description of disabled tool returns None."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("tools:\n  test_tool:\n    enabled: false\n    description: 'Test description'\n")
-            tmp_path = Path(tmp.name)
-
-        try:
-            with patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                desc = get_tool_description("test_tool")
-                assert desc is None
-        finally:
-            tmp_path.unlink()
+        desc = get_tool_description("disabled_tool")
+        assert desc is None
 
     @pytest.mark.unit
-    def test_get_tool_description_not_found(self):
+    def test_get_tool_description_not_found(self, combined_settings):
         """Test getting description of nonexistent tool returns None."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("tools:\n  other_tool:\n    enabled: true\n    description: 'Test'\n")
-            tmp_path = Path(tmp.name)
-
-        try:
-            with patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                desc = get_tool_description("nonexistent_tool")
-                assert desc is None
-        finally:
-            tmp_path.unlink()
+        desc = get_tool_description("nonexistent_tool")
+        assert desc is None
 
     @pytest.mark.unit
-    def test_get_tool_description_with_variables(self):
+    def test_get_tool_description_with_variables(self, combined_settings):
         """Test tool description with multiple template variables."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("tools:\n  test_tool:\n    enabled: true\n    description: '{agent_name} - {config_sections}'\n")
-            tmp_path = Path(tmp.name)
+        desc = get_tool_description("multi_var_tool", agent_name="Alice", config_sections="memory, background")
+        assert desc == "Alice - memory, background"
+
+    @pytest.mark.unit
+    def test_get_tool_description_matches_str_format(self, write_yaml):
+        """Test precompiled rendering keeps str.format semantics (escaped braces, repeats, format specs)."""
+        template = "{{literal}} {agent_name}/{agent_name} [{config_sections:>4}]"
+        tools_path = write_yaml(f"tools:\n  test_tool:\n    enabled: true\n    description: '{template}'\n")
+
+        with patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tools_path):
+            desc = get_tool_description("test_tool", agent_name="Alice", config_sections="ab")
+            assert desc == template.format(
+                agent_name="Alice", config_sections="ab", situation_builder_note="", memory_subtitles=""
+            )
 
-        try:
-            with patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tmp_path):
-                desc = get_tool_description("test_tool", agent_name="Alice", config_sections="memory, background")
-                assert desc == "Alice - memory, background"
-        finally:
-            tmp_path.unlink()
+    @pytest.mark.unit
+    def test_get_tool_description_group_override(self, write_yaml, tmp_path):
+        """Test group overrides are applied, and picked up again after the group config reloads."""
+        tools_path = write_yaml(
+            "tools:\n  test_tool:\n    enabled: true\n    description: 'Base {agent_name}'\n", "tools.yaml"
+        )
+        (tmp_path / "group_g").mkdir()
+        group_path = write_yaml(
+            "tools:\n  test_tool:\n    description: 'Group {agent_name}'\n", "group_g/group_config.yaml"
+        )
+
+        with (
+            patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tools_path),
+            patch.object(Settings, "agents_dir", new_callable=PropertyMock, return_value=tmp_path),
+        ):
+            assert get_tool_description("test_tool", agent_name="Alice") == "Base Alice"
+            assert get_tool_description("test_tool", agent_name="Alice", group_name="g") == "Group Alice"
+            assert get_tool_description("test_tool", agent_name="Bob", group_name="g") == "Group Bob"
+
+            write_yaml("tools:\n  test_tool:\n    description: 'Updated {agent_name}'\n", "group_g/group_config.yaml")
+            _get_cached_config(group_path, force_reload=True)
+
+            assert get_tool_description("test_tool", agent_name="Alice", group_name="g") == "Updated Alice"
 
     @pytest.mark.unit
-    def test_get_tool_description_guidelines_tool(self):
-        """Test getting guidelines tool description from separate file."""
-        # Create tools config
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("tools:\n  guidelines:\n    enabled: true\n")
-            tools_path = Path(tmp.name)
-
-        # Create guidelines config
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as tmp:
-            tmp.write("active_version: v1\nv1:\n  template: 'Guidelines for {agent_name}'\n")
-            guidelines_path = Path(tmp.name)
-
-        try:
-            with (
-                patch.object(Settings, "tools_config_path", new_callable=PropertyMock, return_value=tools_path),
-                patch.object(
-                    Settings, "guidelines_config_path", new_callable=PropertyMock, return_value=guidelines_path
-                ),
-            ):
-                desc = get_tool_description("guidelines", agent_name="Alice")
-                assert desc == "Guidelines for Alice"
-        finally:
-            tools_path.unlink()
-            guidelines_path.unlink()
+    def test_get_tool_description_guidelines_tool(self, combined_settings):
+        """Test getting guidelines tool description from the guidelines config rather than tools.yaml."""
+        desc = get_tool_description("guidelines", agent_name="Alice")
+        assert desc == "Guidelines for Alice"
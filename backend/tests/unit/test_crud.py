@@ -249,6 +249,36 @@ class TestMessageCRUD:
         assert new_messages[0].id == messages[3].id
         assert new_messages[1].id == messages[4].id
 
+    @pytest.mark.crud
+    async def test_create_messages(self, sample_room, sample_agent, test_db):
+        """Test creating several messages in one call preserves their order."""
+        batch = [
+            schemas.MessageCreate(content=f"Partial {i}", role="assistant", agent_id=sample_agent.id) for i in range(3)
+        ]
+
+        created = await crud.create_messages(test_db, sample_room.id, batch)
+
+        assert [m.content for m in created] == ["Partial 0", "Partial 1", "Partial 2"]
+        messages = await crud.get_messages(test_db, sample_room.id)
+        assert [m.id for m in messages] == [m.id for m in created]
+
+    @pytest.mark.crud
+    async def test_create_messages_empty(self, sample_room, test_db):
+        """Test an empty batch is a no-op."""
+        assert await crud.create_messages(test_db, sample_room.id, []) == []
+
+    @pytest.mark.crud
+    async def test_count_agent_messages(self, sample_room, sample_agent, test_db):
+        """Test counting only agent (assistant) messages in a room."""
+        assert await crud.count_agent_messages(test_db, sample_room.id) == 0
+
+        for i in range(3):
+            message_data = schemas.MessageCreate(content=f"Message {i}", role="assistant", agent_id=sample_agent.id)
+            await crud.create_message(test_db, sample_room.id, message_data)
+        await crud.create_message(test_db, sample_room.id, schemas.MessageCreate(content="Hi", role="user"))
+
+        assert await crud.count_agent_messages(test_db, sample_room.id) == 3
+
     @pytest.mark.crud
     async def test_delete_room_messages(self, sample_room, sample_agent, test_db):
         """Test deleting all messages in a room."""
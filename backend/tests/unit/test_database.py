@@ -6,15 +6,17 @@ Note: SQLite-specific retry logic tests have been removed since
 we now use PostgreSQL which handles concurrency natively.
 """
 
+import database
 import pytest
 from database import get_db, retry_on_db_lock
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
 
 
 class TestRetryOnDbLock:
     """Tests for retry_on_db_lock decorator (PostgreSQL: no-op)."""
 
     @pytest.mark.unit
-    @pytest.mark.asyncio
     async def test_successful_operation_no_retry(self):
         """Test decorator with successful operation (no retry needed)."""
         call_count = 0
@@ -31,7 +33,6 @@ class TestRetryOnDbLock:
         assert call_count == 1
 
     @pytest.mark.unit
-    @pytest.mark.asyncio
     async def test_decorator_is_passthrough_for_postgresql(self):
         """Test that decorator is a passthrough for PostgreSQL (no retry logic)."""
         call_count = 0
@@ -52,7 +53,6 @@ class TestRetryOnDbLock:
         assert call_count == 1
 
     @pytest.mark.unit
-    @pytest.mark.asyncio
     async def test_raises_exceptions_immediately(self):
         """Test decorator raises exceptions without retry."""
         call_count = 0
@@ -74,7 +74,6 @@ class TestGetDb:
     """Tests for get_db dependency."""
 
     @pytest.mark.unit
-    @pytest.mark.asyncio
     async def test_get_db_yields_session(self):
         """Test get_db yields an AsyncSession."""
         session_gen = get_db()
@@ -92,7 +91,6 @@ class TestGetDb:
             pass
 
     @pytest.mark.unit
-    @pytest.mark.asyncio
     async def test_get_db_closes_session(self):
         """Test get_db properly closes the session."""
         session_gen = get_db()
@@ -108,3 +106,25 @@ class TestGetDb:
             pass
 
         # Session should be closed after generator finishes
+
+
+class TestGetEngine:
+    """Tests for get_engine configuration."""
+
+    @pytest.mark.unit
+    async def test_in_memory_sqlite_shares_one_connection(self, monkeypatch):
+        """Test an in-memory SQLite URL gets a StaticPool so all connections see the same database."""
+        monkeypatch.setenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+        monkeypatch.setattr(database, "_engine", None)
+
+        engine = database.get_engine()
+        try:
+            assert isinstance(engine.pool, StaticPool)
+
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE shared (id INTEGER)"))
+            async with engine.connect() as conn:
+                result = await conn.execute(text("SELECT count(*) FROM shared"))
+                assert result.scalar() == 0
+        finally:
+            await engine.dispose()
@@ -7,19 +7,30 @@ Tests dependency injection functions.
 from unittest.mock import MagicMock
 
 import pytest
-from dependencies import get_agent_manager, get_chat_orchestrator
+from dependencies import bind_singletons, get_agent_manager, get_chat_orchestrator
 from orchestration import ChatOrchestrator
 from sdk import AgentManager
 
 
+@pytest.fixture(scope="module")
+def mock_agent_manager():
+    """Spec'd AgentManager mock, built once per module (tests only check identity)."""
+    return MagicMock(spec=AgentManager)
+
+
+@pytest.fixture(scope="module")
+def mock_chat_orchestrator():
+    """Spec'd ChatOrchestrator mock, built once per module (tests only check identity)."""
+    return MagicMock(spec=ChatOrchestrator)
+
+
 class TestDependencies:
     """Tests for dependency functions."""
 
     @pytest.mark.unit
-    def test_get_agent_manager(self):
+    def test_get_agent_manager(self, mock_agent_manager):
         """Test get_agent_manager returns AgentManager from app state."""
         # Create mock request with app state
-        mock_agent_manager = MagicMock(spec=AgentManager)
         mock_app = MagicMock()  # Don't use spec for app to allow state attribute
         mock_app.state.agent_manager = mock_agent_manager
 
@@ -31,16 +42,30 @@ class TestDependencies:
         assert manager is mock_agent_manager
 
     @pytest.mark.unit
-    def test_get_chat_orchestrator(self):
+    def test_get_chat_orchestrator(self, mock_chat_orchestrator):
         """Test get_chat_orchestrator returns ChatOrchestrator from app state."""
         # Create mock request with app state
-        mock_orchestrator = MagicMock(spec=ChatOrchestrator)
         mock_app = MagicMock()  # Don't use spec for app to allow state attribute
-        mock_app.state.chat_orchestrator = mock_orchestrator
+        mock_app.state.chat_orchestrator = mock_chat_orchestrator
 
         mock_request = MagicMock()
         mock_request.app = mock_app
 
         orchestrator = get_chat_orchestrator(mock_request)
 
-        assert orchestrator is mock_orchestrator
+        assert orchestrator is mock_chat_orchestrator
+
+    @pytest.mark.unit
+    def test_bound_singletons_take_precedence(self, mock_agent_manager, mock_chat_orchestrator):
+        """Test instances bound at startup are returned without reading app state."""
+        mock_request = MagicMock()
+
+        bind_singletons(mock_agent_manager, mock_chat_orchestrator)
+        try:
+            assert get_agent_manager(mock_request) is mock_agent_manager
+            assert get_chat_orchestrator(mock_request) is mock_chat_orchestrator
+        finally:
+            bind_singletons(None, None)
+
+        # Unbound again: falls back to app state
+        assert get_agent_manager(mock_request) is mock_request.app.state.agent_manager
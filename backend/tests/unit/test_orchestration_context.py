@@ -4,10 +4,50 @@ Unit tests for orchestration context builder.
 Tests conversation context building from room messages.
 """
 
-import os
-from unittest.mock import Mock, patch
-
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+from core.settings import SKIP_MESSAGE_TEXT
+from infrastructure.cache import get_cache, room_messages_key
 from orchestration.context import build_conversation_context
+from orchestration.whiteboard import WHITEBOARD_AGENT_NAME
+
+
+@dataclass(frozen=True, slots=True)
+class FakeAgent:
+    """Stand-in for the Agent relationship on a message."""
+
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class FakeMsg:
+    """Stand-in for a Message row with just the attributes the context builder reads."""
+
+    role: str
+    content: str
+    id: Optional[int] = None
+    agent_id: Optional[int] = None
+    agent: Optional[FakeAgent] = None
+    participant_type: Optional[str] = None
+    participant_name: Optional[str] = None
+    image_data: Optional[str] = None
+    image_media_type: Optional[str] = None
+
+
+def user_msg(content: str, **kwargs) -> FakeMsg:
+    return FakeMsg(role="user", content=content, participant_type="user", **kwargs)
+
+
+def agent_msg(content: str, agent_id: int, name: str) -> FakeMsg:
+    return FakeMsg(role="assistant", content=content, agent_id=agent_id, agent=FakeAgent(name))
+
+
+# Long room history for the limit test, built once at import
+_BULK_MSGS = [user_msg(f"Message {i}") for i in range(100)]
 
 
 def extract_text_from_blocks(content_blocks: list) -> str:
@@ -17,242 +57,221 @@ def extract_text_from_blocks(content_blocks: list) -> str:
     return "\n".join(block.get("text", "") for block in content_blocks if block.get("type") == "text")
 
 
-class TestBuildConversationContext:
-    """Tests for build_conversation_context function."""
-
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_no_messages(self, mock_get_config):
-        """Test building context with no messages."""
-        mock_get_config.return_value = {
-            "conversation_context": {
-                "header": "Conversation:",
-                "footer": "",
-            }
+@pytest.fixture(scope="module")
+def ctx_config():
+    """Conversation context config shared by every test in this module."""
+    return {
+        "conversation_context": {
+            "header": "Conversation:",
+            "footer": "",
+            "response_instruction": "Respond as {agent_name}.",
         }
+    }
 
-        content_blocks = build_conversation_context([])
-
-        assert content_blocks == []
 
-    @patch("orchestration.context.get_conversation_context_config")
-    @patch("orchestration.context._settings")
-    def test_build_context_with_user_messages(self, mock_settings, mock_get_config):
-        """Test building context with user messages."""
-        mock_get_config.return_value = {
-            "conversation_context": {
-                "header": "Conversation:",
-                "footer": "",
-            }
-        }
-
-        # Mock the settings object to return our test user name
-        mock_settings.user_name = "TestUser"
-
-        # Create mock messages with image_data=None to avoid Mock truthiness
-        msg1 = Mock(
-            role="user",
-            content="Hello!",
-            participant_type="user",
-            participant_name=None,
-            agent_id=None,
-            image_data=None,
-        )
-
-        msg2 = Mock(
-            role="user",
-            content="How are you?",
-            participant_type="user",
-            participant_name=None,
-            agent_id=None,
-            image_data=None,
-        )
-
-        content_blocks = build_conversation_context([msg1, msg2])
-        context = extract_text_from_blocks(content_blocks)
+@pytest.fixture(scope="module", autouse=True)
+def _user_name():
+    """Pin the user's display name once for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("orchestration.context._settings", SimpleNamespace(user_name="TestUser"))
+        yield
 
-        assert "Conversation:" in context
-        assert "<TestUser>Hello!</TestUser>" in context
-        assert "<TestUser>How are you?</TestUser>" in context
 
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_agent_messages(self, mock_get_config):
-        """Test building context with agent messages."""
-        mock_get_config.return_value = {"conversation_context": {"header": "Conversation:", "footer": ""}}
+@pytest.fixture(autouse=True)
+def _patch_context_config(monkeypatch, ctx_config):
+    monkeypatch.setattr("orchestration.context.get_conversation_context_config", lambda: ctx_config)
 
-        # Create mock agent with name attribute properly set
-        mock_agent = Mock()
-        mock_agent.name = "Alice"
 
-        msg = Mock(role="assistant", content="Hi there!", agent_id=1, agent=mock_agent, image_data=None)
+class TestBuildConversationContext:
+    """Tests for build_conversation_context function."""
 
-        content_blocks = build_conversation_context([msg])
-        context = extract_text_from_blocks(content_blocks)
+    def test_build_context_with_no_messages(self):
+        """Test building context with no messages."""
+        content_blocks = build_conversation_context([])
 
-        assert "<Alice>Hi there!</Alice>" in context
+        assert content_blocks == []
 
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_skips_skip_messages(self, mock_get_config):
-        """Test that skip messages are excluded from context."""
-        mock_get_config.return_value = {"conversation_context": {"header": "Conversation:", "footer": ""}}
+    @pytest.mark.parametrize(
+        "messages,kwargs,expect_in,expect_not_in",
+        [
+            pytest.param(
+                [user_msg("Hello!"), user_msg("How are you?")],
+                {},
+                ["Conversation:", "<TestUser>Hello!</TestUser>", "<TestUser>How are you?</TestUser>"],
+                [],
+                id="user_messages",
+            ),
+            pytest.param(
+                [agent_msg("Hi there!", 1, "Alice")],
+                {},
+                ["<Alice>Hi there!</Alice>"],
+                [],
+                id="agent_messages",
+            ),
+            pytest.param(
+                [agent_msg(SKIP_MESSAGE_TEXT, 1, "Alice"), agent_msg("Real message", 2, "Bob")],
+                {},
+                ["<Bob>Real message</Bob>"],
+                [SKIP_MESSAGE_TEXT, "<Alice>"],
+                id="skips_skip_messages",
+            ),
+            # Only messages after the agent's last response are included
+            pytest.param(
+                [
+                    user_msg("Message 1"),
+                    agent_msg("Agent response", 1, "Alice"),
+                    user_msg("Message 2"),
+                    user_msg("Message 3"),
+                ],
+                {"agent_id": 1},
+                ["<TestUser>Message 2</TestUser>", "<TestUser>Message 3</TestUser>"],
+                ["Message 1", "Agent response"],
+                id="agent_id_filter",
+            ),
+            pytest.param(
+                _BULK_MSGS,
+                {"limit": 5},
+                ["<TestUser>Message 95</TestUser>", "<TestUser>Message 99</TestUser>"],
+                ["Message 0", "Message 90"],
+                id="limit",
+            ),
+            # participant_name is used as the speaker
+            pytest.param(
+                [
+                    FakeMsg(
+                        role="user",
+                        content="Hello from character!",
+                        participant_type="character",
+                        participant_name="Charlie",
+                    )
+                ],
+                {},
+                ["<Charlie>Hello from character!</Charlie>"],
+                [],
+                id="character_participant",
+            ),
+            # Spaces in the speaker become underscores for valid XML tags
+            pytest.param(
+                [FakeMsg(role="user", content="Scenario description", participant_type="situation_builder")],
+                {},
+                ["<Situation_Builder>Scenario description</Situation_Builder>"],
+                [],
+                id="situation_builder",
+            ),
+        ],
+    )
+    def test_build_context(self, messages, kwargs, expect_in, expect_not_in):
+        """Test the rendered context for each message scenario."""
+        context = extract_text_from_blocks(build_conversation_context(messages, **kwargs))
+
+        # Expected entries must be whole lines, so a speaker can't match by bleeding into content
+        lines = set(context.splitlines())
+        for expected in expect_in:
+            assert expected in lines
+        for unexpected in expect_not_in:
+            assert unexpected not in context
+
+    def test_build_context_with_response_instruction(self, monkeypatch):
+        """Test response instruction is added when agent_name is provided."""
+        mock_format_particles = Mock(return_value="Respond as Alice.")
+        monkeypatch.setattr("orchestration.context.format_with_particles", mock_format_particles)
 
-        # Import SKIP_MESSAGE_TEXT
-        from core.settings import SKIP_MESSAGE_TEXT
+        content_blocks = build_conversation_context([user_msg("Hello")], agent_name="Alice")
+        context = extract_text_from_blocks(content_blocks)
 
-        msg1 = Mock(role="assistant", content=SKIP_MESSAGE_TEXT, agent_id=1, agent=Mock(name="Alice"), image_data=None)
+        # Should use response instruction template
+        mock_format_particles.assert_called_once()
+        assert "Respond as Alice." in context
 
-        msg2 = Mock(role="assistant", content="Real message", agent_id=2, agent=Mock(name="Bob"), image_data=None)
+    def test_build_context_deduplicates_messages(self):
+        """Test that duplicate messages are filtered out."""
+        # Create duplicate messages
+        messages = [user_msg("Same message"), user_msg("Same message"), user_msg("Different message")]
 
-        content_blocks = build_conversation_context([msg1, msg2])
+        content_blocks = build_conversation_context(messages)
         context = extract_text_from_blocks(content_blocks)
 
-        # Should not include skip message
-        assert SKIP_MESSAGE_TEXT not in context
-        assert "Real message" in context
-
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_agent_id_filter(self, mock_get_config):
-        """Test building context with agent_id filter (only new messages)."""
-        mock_get_config.return_value = {"conversation_context": {"header": "Conversation:", "footer": ""}}
+        # Should only include "Same message" once
+        assert context.count("Same message") == 1
+        assert "Different message" in context
 
-        # Create messages before and after agent's last response
+    def test_build_context_splits_text_around_images(self):
+        """Test that an image message splits the text into blocks around an inline image block."""
         messages = [
-            Mock(role="user", content="Message 1", agent_id=None, participant_type="user", image_data=None),
-            Mock(role="assistant", content="Agent response", agent_id=1, agent=Mock(name="Alice"), image_data=None),
-            Mock(role="user", content="Message 2", agent_id=None, participant_type="user", image_data=None),
-            Mock(role="user", content="Message 3", agent_id=None, participant_type="user", image_data=None),
+            user_msg("Look at this", image_data="abc", image_media_type="image/png"),
+            agent_msg("Nice!", 1, "Alice"),
         ]
 
-        with patch.dict(os.environ, {"USER_NAME": "User"}):
-            content_blocks = build_conversation_context(messages, agent_id=1)
-            context = extract_text_from_blocks(content_blocks)
-
-        # Should only include messages after agent's last response
-        assert "Message 1" not in context
-        assert "Agent response" not in context
-        assert "Message 2" in context
-        assert "Message 3" in context
+        content_blocks = build_conversation_context(messages)
 
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_limit(self, mock_get_config):
-        """Test building context respects message limit."""
-        mock_get_config.return_value = {"conversation_context": {"header": "", "footer": ""}}
+        assert [block["type"] for block in content_blocks] == ["text", "image", "text"]
+        assert content_blocks[0]["text"] == "Conversation:\n<TestUser>"
+        assert content_blocks[1]["source"] == {"type": "base64", "media_type": "image/png", "data": "abc"}
+        assert content_blocks[2]["text"] == "Look at this</TestUser>\n<Alice>Nice!</Alice>"
 
-        # Create many messages
+    def test_build_context_renders_whiteboard_state_from_outside_window(self):
+        """Test that whiteboard diffs before the limit window still feed the rendered state."""
         messages = [
-            Mock(role="user", content=f"Message {i}", agent_id=None, participant_type="user", image_data=None)
-            for i in range(100)
+            FakeMsg(
+                role="assistant",
+                content="[화이트보드 diff]\n+ first",
+                id=1,
+                agent_id=9,
+                agent=FakeAgent(WHITEBOARD_AGENT_NAME),
+            ),
+            FakeMsg(
+                role="assistant",
+                content="[화이트보드 diff]\n+ second",
+                id=2,
+                agent_id=9,
+                agent=FakeAgent(WHITEBOARD_AGENT_NAME),
+            ),
         ]
 
-        content_blocks = build_conversation_context(messages, limit=5)
-        context = extract_text_from_blocks(content_blocks)
+        context = extract_text_from_blocks(build_conversation_context(messages, limit=1))
 
-        # Should only include last 5 messages (+ header/footer)
-        assert "Message 95" in context
-        assert "Message 99" in context
-        assert "Message 0" not in context
-        assert "Message 90" not in context
-
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_character_participant(self, mock_get_config):
-        """Test building context with character participant type."""
-        mock_get_config.return_value = {"conversation_context": {"header": "", "footer": ""}}
-
-        msg = Mock(
-            role="user",
-            content="Hello from character!",
-            participant_type="character",
-            participant_name="Charlie",
-            agent_id=None,
-            image_data=None,
-        )
-
-        content_blocks = build_conversation_context([msg])
-        context = extract_text_from_blocks(content_blocks)
+        assert "[화이트보드]\nfirst\nsecond" in context
+        assert "+ second" not in context
 
-        # Should use participant_name as speaker
-        assert "<Charlie>Hello from character!</Charlie>" in context
 
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_with_situation_builder(self, mock_get_config):
-        """Test building context with situation_builder participant."""
-        mock_get_config.return_value = {"conversation_context": {"header": "", "footer": ""}}
+class TestBuildConversationContextCache:
+    """Tests for the per-room memoization in build_conversation_context."""
 
-        msg = Mock(
-            role="user",
-            content="Scenario description",
-            participant_type="situation_builder",
-            participant_name=None,
-            agent_id=None,
-            image_data=None,
-        )
+    ROOM_ID = 4242
 
-        content_blocks = build_conversation_context([msg])
-        context = extract_text_from_blocks(content_blocks)
+    @pytest.fixture(autouse=True)
+    def _clear_room_cache(self):
+        yield
+        get_cache().invalidate_pattern(room_messages_key(self.ROOM_ID))
 
-        # Should use "Situation Builder" as speaker (with underscores for valid XML)
-        assert "<Situation_Builder>Scenario description</Situation_Builder>" in context
+    def test_reuses_blocks_for_same_history_tail(self):
+        """Test that a repeat call with the same room and tail returns the memoized blocks."""
+        messages = [user_msg("Hello", id=1)]
 
-    @patch("orchestration.context.get_conversation_context_config")
-    @patch("orchestration.context.format_with_particles")
-    def test_build_context_with_response_instruction(self, mock_format_particles, mock_get_config):
-        """Test response instruction is added when agent_name is provided."""
-        mock_get_config.return_value = {
-            "conversation_context": {
-                "header": "",
-                "footer": "",
-                "response_instruction": "Respond as {agent_name}.",
-            }
-        }
-        mock_format_particles.return_value = "Respond as Alice."
+        first = build_conversation_context(messages, agent_id=1, room_id=self.ROOM_ID)
+        second = build_conversation_context(messages, agent_id=1, room_id=self.ROOM_ID)
 
-        msg = Mock(
-            role="user", content="Hello", participant_type="user", participant_name=None, agent_id=None, image_data=None
-        )
+        assert second is first
 
-        content_blocks = build_conversation_context([msg], agent_name="Alice")
-        context = extract_text_from_blocks(content_blocks)
+    def test_rebuilds_after_new_message(self):
+        """Test that a new tail message or room cache invalidation produces fresh blocks."""
+        messages = [user_msg("Hello", id=1)]
+        first = build_conversation_context(messages, agent_id=1, room_id=self.ROOM_ID)
 
-        # Should use response instruction template
-        mock_format_particles.assert_called_once()
-        assert "Respond as Alice." in context
+        extended = build_conversation_context([*messages, user_msg("Again", id=2)], agent_id=1, room_id=self.ROOM_ID)
+        assert "Again" in extract_text_from_blocks(extended)
 
-    @patch("orchestration.context.get_conversation_context_config")
-    def test_build_context_deduplicates_messages(self, mock_get_config):
-        """Test that duplicate messages are filtered out."""
-        mock_get_config.return_value = {"conversation_context": {"header": "", "footer": ""}}
+        get_cache().invalidate_pattern(room_messages_key(self.ROOM_ID))
+        assert build_conversation_context(messages, agent_id=1, room_id=self.ROOM_ID) is not first
 
-        # Create duplicate messages
-        messages = [
-            Mock(
-                role="user",
-                content="Same message",
-                agent_id=None,
-                participant_type="user",
-                participant_name=None,
-                image_data=None,
-            ),
-            Mock(
-                role="user",
-                content="Same message",
-                agent_id=None,
-                participant_type="user",
-                participant_name=None,
-                image_data=None,
-            ),
-            Mock(
-                role="user",
-                content="Different message",
-                agent_id=None,
-                participant_type="user",
-                participant_name=None,
-                image_data=None,
-            ),
-        ]
 
-        with patch.dict(os.environ, {"USER_NAME": "User"}):
-            content_blocks = build_conversation_context(messages)
-            context = extract_text_from_blocks(content_blocks)
+def test_build_context_perf(benchmark):
+    """Benchmark a 1k-message history to catch quadratic regressions in context assembly.
 
-        # Should only include "Same message" once
-        assert context.count("Same message") == 1
-        assert "Different message" in context
+    pytest-benchmark only times this when run serially (``poe test-bench``); under xdist it runs once.
+    """
+    messages = [user_msg(f"m{i}", id=i) for i in range(1000)]
+
+    content_blocks = benchmark(build_conversation_context, messages, limit=1000)
+
+    assert extract_text_from_blocks(content_blocks).count("<TestUser>") == 1000
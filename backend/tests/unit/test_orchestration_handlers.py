@@ -4,93 +4,83 @@ Unit tests for orchestration message handlers.
 Tests message saving functionality for polling architecture.
 """
 
-from datetime import datetime
-from unittest.mock import AsyncMock, Mock, patch
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from domain.contexts import AgentMessageData, MessageContext
 from orchestration.handlers import save_agent_message
 
+# Fixed timestamp so tests don't depend on the wall clock
+FROZEN_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-class TestSaveAgentMessage:
-    """Tests for save_agent_message function."""
+_SAVED_MSG = Mock(id=123, content="Hello world", role="assistant", timestamp=FROZEN_TS)
+_AGENT = Mock(id=1, name="Alice", profile_pic="pic.jpg")
+_BASE_MSG = AgentMessageData(content="Hello world", thinking="Thinking process")
 
-    @pytest.mark.asyncio
-    async def test_save_message_with_thinking(self):
-        """Test saving agent message with thinking text."""
-        mock_db = AsyncMock()
-        mock_agent = Mock(id=1, name="Alice", profile_pic="pic.jpg")
 
-        saved_message = Mock(id=123, content="Hello world", role="assistant", timestamp=datetime.utcnow())
+@pytest.fixture
+def mock_db():
+    return AsyncMock()
 
-        with patch("orchestration.handlers.crud.create_message", return_value=saved_message) as mock_create:
-            context = MessageContext(
-                db=mock_db,
-                room_id=1,
-                agent=mock_agent,
-            )
 
-            message_data = AgentMessageData(content="Hello world", thinking="Thinking process")
+@pytest.fixture
+def context(mock_db):
+    return MessageContext(db=mock_db, room_id=1, agent=_AGENT)
 
-            msg_id = await save_agent_message(context, message_data)
 
-            # Should save message to database
-            mock_create.assert_awaited_once()
-            create_call_args = mock_create.call_args[0]
-            assert create_call_args[1] == 1  # room_id
+@pytest.fixture
+def mock_create(monkeypatch):
+    """Stub crud.create_message so no database is touched."""
+    create = AsyncMock(return_value=_SAVED_MSG)
+    monkeypatch.setattr("orchestration.handlers.crud.create_message", create)
+    return create
 
-            # Verify message content
-            message_arg = mock_create.call_args[0][2]
-            assert message_arg.content == "Hello world"
-            assert message_arg.thinking == "Thinking process"
 
-            # Should return message ID
-            assert msg_id == 123
+class TestSaveAgentMessage:
+    """Tests for save_agent_message function."""
 
-    @pytest.mark.asyncio
-    async def test_save_message_without_thinking(self):
-        """Test saving agent message without thinking text."""
-        mock_db = AsyncMock()
-        mock_agent = Mock(id=1, name="Alice")
+    async def test_save_message_with_thinking(self, context, mock_create):
+        """Test saving agent message with thinking text."""
+        msg_id = await save_agent_message(context, _BASE_MSG)
 
-        saved_message = Mock(id=456, content="Hello", timestamp=datetime.utcnow())
+        # Should save message to database
+        mock_create.assert_awaited_once()
+        create_call_args = mock_create.call_args[0]
+        assert create_call_args[1] == 1  # room_id
 
-        with patch("orchestration.handlers.crud.create_message", return_value=saved_message) as mock_create:
-            context = MessageContext(
-                db=mock_db,
-                room_id=1,
-                agent=mock_agent,
-            )
+        # Verify message content
+        message_arg = mock_create.call_args[0][2]
+        assert message_arg.content == "Hello world"
+        assert message_arg.thinking == "Thinking process"
 
-            message_data = AgentMessageData(content="Hello")
+        # Should return message ID
+        assert msg_id == 123
 
-            msg_id = await save_agent_message(context, message_data)
+    async def test_save_message_without_thinking(self, context, mock_create):
+        """Test saving agent message without thinking text."""
+        msg_id = await save_agent_message(context, replace(_BASE_MSG, thinking=None))
 
-            # Thinking should be None in saved message
-            message_arg = mock_create.call_args[0][2]
-            assert message_arg.thinking is None
+        # Thinking should be None in saved message
+        message_arg = mock_create.call_args[0][2]
+        assert message_arg.thinking is None
 
-            assert msg_id == 456
+        assert msg_id == 123
 
-    @pytest.mark.asyncio
-    async def test_save_message_updates_room_activity(self):
+    async def test_save_message_updates_room_activity(self, context, mock_create):
         """Test that saving message updates room activity for unread notifications."""
-        mock_db = AsyncMock()
-        mock_agent = Mock(id=1, name="Alice")
-
-        saved_message = Mock(id=789, timestamp=datetime.utcnow())
+        await save_agent_message(context, _BASE_MSG)
 
-        with patch("orchestration.handlers.crud.create_message", return_value=saved_message) as mock_create:
-            context = MessageContext(
-                db=mock_db,
-                room_id=1,
-                agent=mock_agent,
-            )
+        # Verify update_room_activity=True was passed
+        call_kwargs = mock_create.call_args[1]
+        assert call_kwargs.get("update_room_activity") is True
 
-            message_data = AgentMessageData(content="Test message")
 
-            await save_agent_message(context, message_data)
+class TestMessageDataImmutability:
+    """Tests that shared handler inputs can't be mutated between uses."""
 
-            # Verify update_room_activity=True was passed
-            call_kwargs = mock_create.call_args[1]
-            assert call_kwargs.get("update_room_activity") is True
+    def test_agent_message_data_is_frozen(self):
+        """Test that AgentMessageData rejects attribute assignment."""
+        with pytest.raises(FrozenInstanceError):
+            _BASE_MSG.thinking = None
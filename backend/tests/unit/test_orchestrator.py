@@ -8,9 +8,11 @@ import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from domain.contexts import OrchestrationContext
 from domain.task_identifier import TaskIdentifier
 from orchestration.critic import process_critic_feedback
 from orchestration.orchestrator import MAX_FOLLOW_UP_ROUNDS, MAX_TOTAL_MESSAGES, ChatOrchestrator
+from sdk import AgentManager
 
 
 class TestChatOrchestratorInit:
@@ -25,6 +27,7 @@ class TestChatOrchestratorInit:
         assert orchestrator.active_room_tasks == {}
         assert orchestrator.last_user_message_time == {}
         assert orchestrator.response_generator is not None
+        assert orchestrator._interrupt == orchestrator.interrupt_room_processing
 
     def test_init_with_custom_limits(self):
         """Test initialization with custom limits."""
@@ -37,55 +40,76 @@ class TestChatOrchestratorInit:
 class TestGetChattingAgents:
     """Tests for get_chatting_agents method."""
 
+    @staticmethod
+    def _manager_with(*task_ids: TaskIdentifier) -> AgentManager:
+        manager = AgentManager()
+        for task_id in task_ids:
+            manager._register_client(task_id, Mock())
+        return manager
+
     def test_get_chatting_agents_with_active_clients(self):
-        """Test retrieving list of chatting agents."""
+        """Test retrieving the set of chatting agents."""
         orchestrator = ChatOrchestrator()
-        mock_manager = Mock()
-        mock_manager.active_clients = {
-            TaskIdentifier(room_id=1, agent_id=10): Mock(),
-            TaskIdentifier(room_id=1, agent_id=20): Mock(),
-            TaskIdentifier(room_id=2, agent_id=30): Mock(),
-        }
+        manager = self._manager_with(
+            TaskIdentifier(room_id=1, agent_id=10),
+            TaskIdentifier(room_id=1, agent_id=20),
+            TaskIdentifier(room_id=2, agent_id=30),
+        )
 
-        chatting_agents = orchestrator.get_chatting_agents(1, mock_manager)
+        chatting_agents = orchestrator.get_chatting_agents(1, manager)
 
         # Should return agents for room 1 only
-        assert sorted(chatting_agents) == [10, 20]
+        assert chatting_agents == {10, 20}
 
     def test_get_chatting_agents_with_no_active_clients(self):
         """Test with no active clients."""
         orchestrator = ChatOrchestrator()
-        mock_manager = Mock()
-        mock_manager.active_clients = {}
+        manager = self._manager_with()
 
-        chatting_agents = orchestrator.get_chatting_agents(1, mock_manager)
+        chatting_agents = orchestrator.get_chatting_agents(1, manager)
 
-        assert chatting_agents == []
+        assert chatting_agents == frozenset()
 
     def test_get_chatting_agents_filters_by_room(self):
         """Test that only agents from the specified room are returned."""
         orchestrator = ChatOrchestrator()
-        mock_manager = Mock()
-        mock_manager.active_clients = {
-            TaskIdentifier(room_id=1, agent_id=10): Mock(),
-            TaskIdentifier(room_id=2, agent_id=20): Mock(),
-            TaskIdentifier(room_id=3, agent_id=30): Mock(),
-        }
+        manager = self._manager_with(
+            TaskIdentifier(room_id=1, agent_id=10),
+            TaskIdentifier(room_id=2, agent_id=20),
+            TaskIdentifier(room_id=3, agent_id=30),
+        )
 
-        chatting_agents = orchestrator.get_chatting_agents(1, mock_manager)
+        chatting_agents = orchestrator.get_chatting_agents(1, manager)
 
         # Should only include agents from room 1
-        assert chatting_agents == [10]
+        assert chatting_agents == {10}
+
+    def test_get_chatting_agents_drops_unregistered_clients(self):
+        """Test that agents disappear from the room index once their client is unregistered."""
+        orchestrator = ChatOrchestrator()
+        manager = self._manager_with(TaskIdentifier(room_id=1, agent_id=10))
+
+        manager._unregister_client(TaskIdentifier(room_id=1, agent_id=10))
+
+        assert orchestrator.get_chatting_agents(1, manager) == frozenset()
+        assert manager.clients_by_room == {}
 
 
 class TestInterruptRoomProcessing:
     """Tests for interrupt_room_processing method."""
 
-    @pytest.mark.asyncio
+    @staticmethod
+    def _manager(*agent_ids: int) -> AgentManager:
+        manager = AgentManager()
+        manager.interrupt_room = AsyncMock()
+        for agent_id in agent_ids:
+            manager._register_client(TaskIdentifier(room_id=1, agent_id=agent_id), Mock())
+        return manager
+
     async def test_interrupt_room_with_active_task(self):
         """Test interrupting a room with an active task."""
         orchestrator = ChatOrchestrator()
-        mock_manager = AsyncMock()
+        mock_manager = self._manager(10)
 
         # Create a real asyncio.Task that we can cancel
         async def long_running_task():
@@ -103,22 +127,29 @@ class TestInterruptRoomProcessing:
         # Should interrupt agents via manager
         mock_manager.interrupt_room.assert_awaited_once_with(1)
 
-    @pytest.mark.asyncio
     async def test_interrupt_room_with_no_active_task(self):
-        """Test interrupting a room with no active task."""
+        """Test interrupting a room with no active task but active clients."""
         orchestrator = ChatOrchestrator()
-        mock_manager = AsyncMock()
+        mock_manager = self._manager(10)
 
         await orchestrator.interrupt_room_processing(1, mock_manager)
 
         # Should still call interrupt_room on manager
         mock_manager.interrupt_room.assert_awaited_once_with(1)
 
-    @pytest.mark.asyncio
+    async def test_interrupt_idle_room_skips_manager(self):
+        """Test that a room with no task and no active clients doesn't call interrupt_room."""
+        orchestrator = ChatOrchestrator()
+        mock_manager = self._manager()
+
+        await orchestrator.interrupt_room_processing(1, mock_manager)
+
+        mock_manager.interrupt_room.assert_not_awaited()
+
     async def test_interrupt_room_with_completed_task(self):
         """Test interrupting a room where task is already done."""
         orchestrator = ChatOrchestrator()
-        mock_manager = AsyncMock()
+        mock_manager = self._manager()
 
         # Create a completed task
         mock_task = AsyncMock()
@@ -130,11 +161,33 @@ class TestInterruptRoomProcessing:
         # Should not try to cancel completed task
         mock_task.cancel.assert_not_called()
 
+    async def test_interrupt_saves_partial_responses_in_one_batch(self, monkeypatch):
+        """Test that partial responses with content are saved together in one call."""
+        orchestrator = ChatOrchestrator()
+        mock_manager = self._manager()
+        mock_manager.streaming_state = {
+            TaskIdentifier(room_id=1, agent_id=10): {"thinking_text": "hmm", "response_text": "Half a reply"},
+            TaskIdentifier(room_id=1, agent_id=20): {"thinking_text": "", "response_text": "  "},
+            TaskIdentifier(room_id=1, agent_id=30): {"thinking_text": "", "response_text": "Another"},
+        }
+        create_messages = AsyncMock()
+        monkeypatch.setattr("orchestration.orchestrator.crud.create_messages", create_messages)
+        mock_db = AsyncMock()
+
+        await orchestrator.interrupt_room_processing(1, mock_manager, db=mock_db)
+
+        create_messages.assert_awaited_once()
+        _, room_id, messages = create_messages.await_args.args
+        assert room_id == 1
+        assert [(m.agent_id, m.content, m.thinking) for m in messages] == [
+            (10, "Half a reply", "hmm"),
+            (30, "Another", None),
+        ]
+
 
 class TestCleanupRoomState:
     """Tests for cleanup_room_state method."""
 
-    @pytest.mark.asyncio
     async def test_cleanup_room_state_complete(self):
         """Test complete room state cleanup."""
         orchestrator = ChatOrchestrator()
@@ -142,7 +195,7 @@ class TestCleanupRoomState:
 
         # Setup room state
         orchestrator.active_room_tasks[1] = AsyncMock()
-        orchestrator.last_user_message_time[1] = 123.456
+        orchestrator.last_user_message_time[1] = 123456
 
         with patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()) as mock_interrupt:
             await orchestrator.cleanup_room_state(1, mock_manager)
@@ -154,14 +207,13 @@ class TestCleanupRoomState:
         assert 1 not in orchestrator.active_room_tasks
         assert 1 not in orchestrator.last_user_message_time
 
-    @pytest.mark.asyncio
     async def test_cleanup_room_state_partial(self):
         """Test cleanup when only some state exists."""
         orchestrator = ChatOrchestrator()
         mock_manager = AsyncMock()
 
         # Only last_user_message_time exists
-        orchestrator.last_user_message_time[1] = 123.456
+        orchestrator.last_user_message_time[1] = 123456
 
         with patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()):
             await orchestrator.cleanup_room_state(1, mock_manager)
@@ -173,10 +225,9 @@ class TestCleanupRoomState:
 class TestHandleUserMessage:
     """Tests for handle_user_message method."""
 
-    @pytest.mark.asyncio
     async def test_handle_user_message_saves_message(self):
         """Test that user message is saved to database."""
-        orchestrator = ChatOrchestrator()
+        orchestrator = ChatOrchestrator(interrupt_hook=AsyncMock())
         mock_db = AsyncMock()
         mock_manager = None  # No broadcasting
         mock_agent_manager = AsyncMock()
@@ -189,7 +240,6 @@ class TestHandleUserMessage:
         with (
             patch("orchestration.orchestrator.crud.create_message", return_value=saved_message) as mock_create,
             patch("orchestration.orchestrator.crud.get_agents", return_value=[]) as mock_get_agents,
-            patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()),
         ):
             await orchestrator.handle_user_message(
                 db=mock_db,
@@ -202,10 +252,9 @@ class TestHandleUserMessage:
             # Should save message
             mock_create.assert_awaited_once()
 
-    @pytest.mark.asyncio
     async def test_handle_user_message_uses_saved_message_id(self):
         """Test using pre-saved message ID."""
-        orchestrator = ChatOrchestrator()
+        orchestrator = ChatOrchestrator(interrupt_hook=AsyncMock())
         mock_db = AsyncMock()
         mock_manager = None
         mock_agent_manager = AsyncMock()
@@ -219,7 +268,6 @@ class TestHandleUserMessage:
         with (
             patch("orchestration.orchestrator.crud.create_message") as mock_create,
             patch("orchestration.orchestrator.crud.get_agents", return_value=[]),
-            patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()),
         ):
             await orchestrator.handle_user_message(
                 db=mock_db,
@@ -233,10 +281,10 @@ class TestHandleUserMessage:
             # Should NOT create new message
             mock_create.assert_not_awaited()
 
-    @pytest.mark.asyncio
     async def test_handle_user_message_interrupts_previous_processing(self):
         """Test that previous processing is interrupted."""
-        orchestrator = ChatOrchestrator()
+        mock_interrupt = AsyncMock()
+        orchestrator = ChatOrchestrator(interrupt_hook=mock_interrupt)
         mock_db = AsyncMock()
         mock_manager = None
         mock_agent_manager = AsyncMock()
@@ -247,7 +295,6 @@ class TestHandleUserMessage:
         with (
             patch("orchestration.orchestrator.crud.create_message", return_value=saved_message),
             patch("orchestration.orchestrator.crud.get_agents", return_value=[]),
-            patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()) as mock_interrupt,
         ):
             await orchestrator.handle_user_message(
                 db=mock_db,
@@ -260,10 +307,9 @@ class TestHandleUserMessage:
             # Should interrupt existing processing (with db for saving partial responses)
             mock_interrupt.assert_awaited_once_with(1, mock_agent_manager, db=mock_db)
 
-    @pytest.mark.asyncio
     async def test_handle_user_message_records_timestamp(self):
         """Test that user message timestamp is recorded."""
-        orchestrator = ChatOrchestrator()
+        orchestrator = ChatOrchestrator(interrupt_hook=AsyncMock())
         mock_db = AsyncMock()
         mock_manager = None
         mock_agent_manager = AsyncMock()
@@ -274,7 +320,6 @@ class TestHandleUserMessage:
         with (
             patch("orchestration.orchestrator.crud.create_message", return_value=saved_message),
             patch("orchestration.orchestrator.crud.get_agents", return_value=[]),
-            patch.object(orchestrator, "interrupt_room_processing", new=AsyncMock()),
         ):
             await orchestrator.handle_user_message(
                 db=mock_db,
@@ -286,19 +331,99 @@ class TestHandleUserMessage:
 
             # Should record timestamp
             assert 1 in orchestrator.last_user_message_time
-            assert isinstance(orchestrator.last_user_message_time[1], float)
+            assert isinstance(orchestrator.last_user_message_time[1], int)
+
+    @pytest.mark.parametrize("outcome", [None, RuntimeError("boom"), asyncio.CancelledError()])
+    async def test_handle_user_message_untracks_finished_task(self, outcome):
+        """Test that the processing task is dropped from active_room_tasks however it ends."""
+        orchestrator = ChatOrchestrator(interrupt_hook=AsyncMock())
+        mock_db = AsyncMock()
+        mock_db.get.return_value = Mock(id=1, content="Hello")
+        mock_agent = Mock(id=1, name="Alice", is_critic=False, interrupt_every_turn=0)
+        seen_tasks = []
+
+        async def process(**kwargs):
+            seen_tasks.append(orchestrator.active_room_tasks.get(1))
+            if outcome is not None:
+                raise outcome
+
+        with (
+            patch("orchestration.orchestrator.crud.get_agents_cached", new=AsyncMock(return_value=[mock_agent])),
+            patch.object(orchestrator, "_process_agent_responses", side_effect=process),
+        ):
+            await orchestrator.handle_user_message(
+                db=mock_db,
+                room_id=1,
+                message_data={"content": "Hello"},
+                _manager=None,
+                agent_manager=AsyncMock(),
+                saved_user_message_id=1,
+            )
+
+        assert seen_tasks[0] is not None
+        assert orchestrator.active_room_tasks == {}
+
+    async def test_handle_user_message_coalesces_burst_within_debounce(self):
+        """Test that rapid messages within the debounce window trigger one pass with the latest message."""
+        mock_interrupt = AsyncMock()
+        orchestrator = ChatOrchestrator(debounce_ms=20, interrupt_hook=mock_interrupt)
+        mock_db = AsyncMock()
+        mock_db.get.return_value = Mock(id=1, content="msg")
+        mock_agent = Mock(id=1, name="Alice", is_critic=False, interrupt_every_turn=0)
+
+        with (
+            patch("orchestration.orchestrator.crud.get_agents_cached", new=AsyncMock(return_value=[mock_agent])),
+            patch.object(orchestrator, "_process_agent_responses", new=AsyncMock()) as mock_process,
+        ):
+            await asyncio.gather(
+                *(
+                    orchestrator.handle_user_message(
+                        db=mock_db,
+                        room_id=1,
+                        message_data={"content": content},
+                        _manager=None,
+                        agent_manager=AsyncMock(),
+                        saved_user_message_id=1,
+                    )
+                    for content in ("first", "second")
+                )
+            )
+
+        mock_interrupt.assert_awaited_once()
+        mock_process.assert_awaited_once()
+        assert mock_process.await_args.kwargs["user_message_content"] == "second"
+        assert orchestrator._pending_user_messages == {}
 
 
 class TestProcessAgentResponses:
     """Tests for _process_agent_responses method with tape-based scheduling."""
 
-    @pytest.mark.asyncio
+    async def test_process_agent_responses_empty_agents_no_db_call(self):
+        """Test that a room with no agents returns before any tape or room lookup."""
+        orchestrator = ChatOrchestrator()
+        mock_orch_context = OrchestrationContext(db=AsyncMock(), room_id=1, agent_manager=AsyncMock())
+
+        with (
+            patch("orchestration.orchestrator.TapeGenerator") as mock_generator_class,
+            patch("orchestration.tape.executor.crud.get_room_cached", new=AsyncMock()) as mock_get_room,
+        ):
+            await orchestrator._process_agent_responses(
+                orch_context=mock_orch_context,
+                agents=[],
+                interrupt_agents=[],
+                critic_agents=[],
+                user_message_content="Hello",
+            )
+
+        mock_generator_class.assert_not_called()
+        mock_get_room.assert_not_awaited()
+
     async def test_process_agent_responses_uses_tape_system(self):
         """Test that tape-based scheduling is used for agent responses."""
         orchestrator = ChatOrchestrator()
         mock_db = AsyncMock()
         mock_agent_manager = AsyncMock()
-        mock_orch_context = Mock(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
+        mock_orch_context = OrchestrationContext(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
 
         # Mock agents with required attributes
         mock_agent1 = Mock(id=1, name="Alice", priority=0, interrupt_every_turn=0, transparent=0)
@@ -343,13 +468,12 @@ class TestProcessAgentResponses:
             mock_generator.generate_initial_round.assert_called_once()
             mock_executor.execute.assert_called()
 
-    @pytest.mark.asyncio
     async def test_process_agent_responses_skips_follow_up_with_one_agent(self):
         """Test that follow-up rounds are skipped with only one agent."""
         orchestrator = ChatOrchestrator()
         mock_db = AsyncMock()
         mock_agent_manager = AsyncMock()
-        mock_orch_context = Mock(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
+        mock_orch_context = OrchestrationContext(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
 
         # Single agent
         mock_agent = Mock(id=1, name="Alice", priority=0, interrupt_every_turn=0, transparent=0)
@@ -388,13 +512,12 @@ class TestProcessAgentResponses:
             mock_generator.generate_initial_round.assert_called_once()
             mock_generator.generate_follow_up_round.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_process_agent_responses_processes_critics(self):
         """Test that critic agents are processed after tape execution."""
         orchestrator = ChatOrchestrator()
         mock_db = AsyncMock()
         mock_agent_manager = AsyncMock()
-        mock_orch_context = Mock(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
+        mock_orch_context = OrchestrationContext(db=mock_db, room_id=1, agent_manager=mock_agent_manager)
 
         mock_agent = Mock(id=1, name="Alice", priority=0, interrupt_every_turn=0, transparent=0)
         mock_critic = Mock(id=2, name="Critic", is_critic=True)
@@ -436,15 +559,28 @@ class TestProcessAgentResponses:
 class TestProcessCriticFeedback:
     """Tests for process_critic_feedback function."""
 
-    @pytest.mark.asyncio
     async def test_process_critic_feedback_concurrent(self):
         """Test that critics process concurrently."""
         mock_orch_context = Mock()
-        mock_response_generator = Mock()
-        mock_response_generator.generate_response = AsyncMock(return_value=True)
-
         critics = [Mock(id=i, name=f"Critic{i}") for i in range(3)]
 
+        # Barrier: no critic finishes until every critic has started, which only
+        # resolves if all of them are scheduled together rather than awaited in turn
+        started = finished = 0
+        all_started = asyncio.Event()
+
+        async def generate_response(**kwargs):
+            nonlocal started, finished
+            started += 1
+            if started == len(critics):
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            finished += 1
+            return True
+
+        mock_response_generator = Mock()
+        mock_response_generator.generate_response = AsyncMock(side_effect=generate_response)
+
         await process_critic_feedback(
             orch_context=mock_orch_context,
             critic_agents=critics,
@@ -452,14 +588,14 @@ class TestProcessCriticFeedback:
             response_generator=mock_response_generator,
         )
 
-        # Should call generate_response for each critic with is_critic=True
+        # Should call generate_response for each critic with is_critic=True, all passing the barrier
         assert mock_response_generator.generate_response.await_count == 3
+        assert finished == 3
 
         # Verify is_critic flag was set
         for call in mock_response_generator.generate_response.await_args_list:
             assert call[1]["is_critic"] is True
 
-    @pytest.mark.asyncio
     async def test_process_critic_feedback_handles_errors(self):
         """Test that critic errors don't stop other critics."""
         mock_orch_context = Mock()
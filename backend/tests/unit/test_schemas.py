@@ -5,10 +5,67 @@ Tests schema validation, serialization, and field transformations.
 """
 
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
+import models
 import pytest
 import schemas
+from conftest import make_sample_agent, make_sample_message, make_sample_room
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+# Fixed timestamp so tests don't depend on the wall clock
+FROZEN_TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# The serialization tests below only read their sample rows, so this module inserts them once and
+# shares them. These fixtures shadow the function-scoped ones from conftest.py for this file only.
+
+
+@pytest.fixture(scope="module")
+async def _module_db(test_engine):
+    """Session on its own connection whose outer transaction is rolled back when the module finishes."""
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
+
+
+@pytest.fixture(scope="module")
+async def sample_agent(_module_db) -> models.Agent:
+    agent = await make_sample_agent(_module_db)
+    await _module_db.refresh(agent)
+    return agent
+
+
+@pytest.fixture(scope="module")
+async def sample_room(_module_db) -> models.Room:
+    room = await make_sample_room(_module_db)
+    # Load the relationships schemas.Room serializes up front, so tests need no refresh round-trip
+    result = await _module_db.execute(
+        select(models.Room)
+        .options(selectinload(models.Room.agents), selectinload(models.Room.messages))
+        .where(models.Room.id == room.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@pytest.fixture(scope="module")
+async def sample_message(_module_db, sample_room, sample_agent) -> models.Message:
+    message = await make_sample_message(_module_db, sample_room, sample_agent)
+    result = await _module_db.execute(
+        select(models.Message)
+        .options(selectinload(models.Message.agent))
+        .where(models.Message.id == message.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
 
 
 class TestAgentSchemas:
@@ -72,11 +129,8 @@ class TestRoomSchemas:
         assert room_update.is_paused is True
 
     @pytest.mark.unit
-    async def test_room_schema_serialization(self, sample_room, test_db):
+    async def test_room_schema_serialization(self, sample_room):
         """Test Room schema from database model."""
-        # Refresh to load relationships
-        await test_db.refresh(sample_room, ["agents", "messages"])
-
         room_schema = schemas.Room.model_validate(sample_room)
 
         assert room_schema.id == sample_room.id
@@ -109,11 +163,8 @@ class TestMessageSchemas:
         assert message.thinking == "Thinking about response"
 
     @pytest.mark.unit
-    async def test_message_schema_with_agent(self, sample_message, test_db):
+    async def test_message_schema_with_agent(self, sample_message):
         """Test Message schema includes agent info."""
-        # Refresh with agent relationship
-        await test_db.refresh(sample_message, ["agent"])
-
         message_schema = schemas.Message.model_validate(sample_message)
 
         assert message_schema.id == sample_message.id
@@ -156,11 +207,8 @@ class TestSchemaDatetimeSerialization:
         assert isinstance(created_at, datetime)
 
     @pytest.mark.unit
-    async def test_room_datetime_serialization(self, sample_room, test_db):
+    async def test_room_datetime_serialization(self, sample_room):
         """Test Room created_at serialization."""
-        # Refresh to load relationships
-        await test_db.refresh(sample_room, ["agents", "messages"])
-
         room_schema = schemas.Room.model_validate(sample_room)
 
         # Check that created_at exists and is a datetime
@@ -169,9 +217,8 @@ class TestSchemaDatetimeSerialization:
         assert isinstance(created_at, datetime)
 
     @pytest.mark.unit
-    async def test_message_datetime_serialization(self, sample_message, test_db):
+    async def test_message_datetime_serialization(self, sample_message):
         """Test Message timestamp serialization."""
-        await test_db.refresh(sample_message, ["agent"])
         message_schema = schemas.Message.model_validate(sample_message)
 
         # Check that timestamp exists and is a datetime
@@ -184,27 +231,23 @@ class TestSchemaBooleanSerialization:
     """Tests for SQLite boolean (int) serialization."""
 
     @pytest.mark.unit
-    async def test_agent_is_critic_serialization(self, test_db):
+    def test_agent_is_critic_serialization(self):
         """Test Agent is_critic field serialization."""
         # Create critic agent (is_critic=1)
         agent = schemas.Agent.model_validate(
-            type(
-                "Agent",
-                (),
-                {
-                    "id": 1,
-                    "name": "test",
-                    "system_prompt": "test",
-                    "created_at": datetime.now(timezone.utc),
-                    "is_critic": 1,  # SQLite integer
-                    "group": None,
-                    "config_file": None,
-                    "profile_pic": None,
-                    "in_a_nutshell": None,
-                    "characteristics": None,
-                    "recent_events": None,
-                },
-            )()
+            SimpleNamespace(
+                id=1,
+                name="test",
+                system_prompt="test",
+                created_at=FROZEN_TS,
+                is_critic=1,  # SQLite integer
+                group=None,
+                config_file=None,
+                profile_pic=None,
+                in_a_nutshell=None,
+                characteristics=None,
+                recent_events=None,
+            )
         )
 
         # Should be converted to boolean
@@ -212,23 +255,19 @@ class TestSchemaBooleanSerialization:
         assert isinstance(agent.is_critic, bool)
 
     @pytest.mark.unit
-    async def test_room_is_paused_serialization(self, test_db):
+    def test_room_is_paused_serialization(self):
         """Test Room is_paused field serialization."""
         # Create paused room (is_paused=1)
         room = schemas.Room.model_validate(
-            type(
-                "Room",
-                (),
-                {
-                    "id": 1,
-                    "name": "test",
-                    "max_interactions": None,
-                    "is_paused": 1,  # SQLite integer
-                    "created_at": datetime.now(timezone.utc),
-                    "agents": [],
-                    "messages": [],
-                },
-            )()
+            SimpleNamespace(
+                id=1,
+                name="test",
+                max_interactions=None,
+                is_paused=1,  # SQLite integer
+                created_at=FROZEN_TS,
+                agents=[],
+                messages=[],
+            )
         )
 
         # Should be converted to boolean
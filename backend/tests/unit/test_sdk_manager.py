@@ -8,7 +8,6 @@ interruption handling, and response generation.
 import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
-import pytest
 from domain.agent_config import AgentConfigData
 from domain.contexts import AgentResponseContext
 from domain.task_identifier import TaskIdentifier
@@ -32,7 +31,6 @@ class TestAgentManagerInit:
 class TestInterruptAll:
     """Tests for interrupt_all method."""
 
-    @pytest.mark.asyncio
     async def test_interrupt_all_with_clients(self):
         """Test interrupting all active clients."""
         manager = AgentManager()
@@ -55,7 +53,6 @@ class TestInterruptAll:
         # Verify active_clients was cleared
         assert manager.active_clients == {}
 
-    @pytest.mark.asyncio
     async def test_interrupt_all_with_no_clients(self):
         """Test interrupt_all with no active clients."""
         manager = AgentManager()
@@ -65,7 +62,6 @@ class TestInterruptAll:
 
         assert manager.active_clients == {}
 
-    @pytest.mark.asyncio
     async def test_interrupt_all_handles_errors(self):
         """Test that interrupt_all handles client errors gracefully."""
         manager = AgentManager()
@@ -86,7 +82,6 @@ class TestInterruptAll:
 class TestInterruptRoom:
     """Tests for interrupt_room method."""
 
-    @pytest.mark.asyncio
     async def test_interrupt_room_with_matching_clients(self):
         """Test interrupting clients in a specific room."""
         manager = AgentManager()
@@ -110,7 +105,6 @@ class TestInterruptRoom:
         assert TaskIdentifier(room_id=1, agent_id=1) not in manager.active_clients
         assert TaskIdentifier(room_id=2, agent_id=1) in manager.active_clients
 
-    @pytest.mark.asyncio
     async def test_interrupt_room_with_no_matching_clients(self):
         """Test interrupt_room when no clients match the room."""
         manager = AgentManager()
@@ -171,7 +165,6 @@ class TestBuildAgentOptions:
 class TestGenerateSDKResponse:
     """Tests for generate_sdk_response async generator."""
 
-    @pytest.mark.asyncio
     async def test_generate_response_basic_flow(self):
         """Test basic response generation flow."""
         manager = AgentManager()
@@ -228,7 +221,6 @@ class TestGenerateSDKResponse:
             # Client should be registered and unregistered
             assert TaskIdentifier(room_id=1, agent_id=1) not in manager.active_clients
 
-    @pytest.mark.asyncio
     async def test_generate_response_handles_cancellation(self):
         """Test response generation handles cancellation."""
         manager = AgentManager()
@@ -267,7 +259,6 @@ class TestGenerateSDKResponse:
             assert events[-1]["type"] == "stream_end"
             assert events[-1]["skipped"] is True
 
-    @pytest.mark.asyncio
     async def test_generate_response_handles_errors(self):
         """Test response generation handles errors gracefully."""
         manager = AgentManager()
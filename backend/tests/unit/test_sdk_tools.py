@@ -6,7 +6,6 @@ Tests tool creation, configuration, and execution.
 
 from unittest.mock import Mock, patch
 
-import pytest
 from sdk.action_tools import create_action_mcp_server, create_action_tools
 from sdk.guidelines_tools import create_guidelines_mcp_server
 
@@ -75,7 +74,6 @@ class TestCreateActionTools:
         # No tools should be created
         assert len(tools) == 0
 
-    @pytest.mark.asyncio
     @patch("sdk.action_tools.is_tool_enabled")
     @patch("sdk.action_tools.get_tool_description")
     @patch("sdk.action_tools.get_tool_response")
@@ -92,7 +90,6 @@ class TestCreateActionTools:
         assert tools[0].name == "skip"
         assert "Skip description" in tools[0].description
 
-    @pytest.mark.asyncio
     @patch("sdk.action_tools.is_tool_enabled")
     @patch("sdk.action_tools.get_tool_description")
     @patch("sdk.action_tools.get_tool_response")
@@ -109,7 +106,6 @@ class TestCreateActionTools:
         assert tools[0].name == "memorize"
         assert "Memorize description" in tools[0].description
 
-    @pytest.mark.asyncio
     @patch("sdk.action_tools.is_tool_enabled")
     @patch("sdk.action_tools.get_tool_description")
     @patch("sdk.action_tools.get_tool_response")
@@ -127,7 +123,6 @@ class TestCreateActionTools:
         assert tools[0].name == "recall"
         assert "Recall description" in tools[0].description
 
-    @pytest.mark.asyncio
     @patch("sdk.action_tools.is_tool_enabled")
     @patch("sdk.action_tools.get_tool_description")
     async def test_recall_tool_without_memory_index(self, mock_get_description, mock_is_enabled):
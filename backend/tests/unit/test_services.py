@@ -4,10 +4,13 @@ Unit tests for service layer functions.
 Tests agent service functions that coordinate between CRUD and other components.
 """
 
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from domain.task_identifier import TaskIdentifier
+from services import agent_config_service
 from services.agent_config_service import AgentConfigService
 from services.agent_service import (
     clear_room_messages_with_cleanup,
@@ -147,3 +150,52 @@ class TestAgentConfigService:
         config = AgentConfigService.load_agent_config("nonexistent/path")
 
         assert config is None
+
+    @pytest.mark.unit
+    async def test_append_to_recent_events_async_coalesces_writes(self, temp_agent_config, monkeypatch):
+        """Test concurrent async appends to the same file are written in one batch."""
+        monkeypatch.setattr(AgentConfigService, "get_project_root", lambda: temp_agent_config.parent.parent)
+
+        with patch.object(
+            AgentConfigService, "_write_recent_events", wraps=AgentConfigService._write_recent_events
+        ) as write_spy:
+            results = await asyncio.gather(
+                *(
+                    AgentConfigService.append_to_recent_events_async("agents/test_agent", f"memory {i}")
+                    for i in range(5)
+                )
+            )
+
+        assert results == [True] * 5
+        write_spy.assert_called_once()
+        assert len(write_spy.call_args.args[1]) == 5
+        content = (temp_agent_config / "recent_events.md").read_text()
+        for i in range(5):
+            assert f"memory {i}" in content
+
+    @pytest.mark.unit
+    async def test_append_to_recent_events_async_writer_cancelled(self, temp_agent_config, monkeypatch):
+        """Test appends are resolved as failed when the writer task is cancelled mid-batch."""
+        monkeypatch.setattr(AgentConfigService, "get_project_root", lambda: temp_agent_config.parent.parent)
+        write_started = threading.Event()
+        release_write = threading.Event()
+
+        def blocking_write(recent_events_file, entries):
+            write_started.set()
+            release_write.wait(timeout=5)
+            return True
+
+        monkeypatch.setattr(AgentConfigService, "_write_recent_events", blocking_write)
+
+        append = asyncio.create_task(AgentConfigService.append_to_recent_events_async("agents/test_agent", "memory"))
+        try:
+            await asyncio.to_thread(write_started.wait, 5)
+            agent_config_service._recent_events_writer.cancel()
+            assert await asyncio.wait_for(append, timeout=5) is False
+        finally:
+            release_write.set()
+
+    @pytest.mark.unit
+    async def test_append_to_recent_events_async_invalid_config(self):
+        """Test async append rejects a missing config directory."""
+        assert await AgentConfigService.append_to_recent_events_async("nonexistent/path", "memory") is False
@@ -0,0 +1,138 @@
+"""
+Unit tests for the tape executor.
+
+Tests limit checking and concurrent fan-out while executing turn tapes.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from domain.contexts import OrchestrationContext
+from orchestration.tape import executor as executor_module
+from orchestration.tape.executor import TapeExecutor
+from orchestration.tape.models import CellType, TurnCell, TurnTape
+
+_AGENTS = {i: SimpleNamespace(id=i, name=f"Agent{i}") for i in (1, 2, 3)}
+
+
+def _tape() -> TurnTape:
+    return TurnTape(cells=[TurnCell(cell_type=CellType.SEQUENTIAL, agent_ids=[i]) for i in _AGENTS])
+
+
+@pytest.fixture
+def orch_context():
+    return OrchestrationContext(db=AsyncMock(), room_id=1, agent_manager=Mock())
+
+
+@pytest.fixture
+def room(monkeypatch):
+    room = SimpleNamespace(is_paused=False, max_interactions=None)
+    monkeypatch.setattr(executor_module.crud, "get_room_cached", AsyncMock(return_value=room))
+    return room
+
+
+@pytest.fixture
+def executor():
+    response_generator = Mock(generate_response=AsyncMock(return_value=True))
+    executor = TapeExecutor(response_generator=response_generator, agents_by_id=_AGENTS, max_total_messages=30)
+    executor._count_agent_messages = AsyncMock(return_value=0)
+    return executor
+
+
+class TestMaxInteractions:
+    """Tests for the room.max_interactions limit check."""
+
+    async def test_counts_agent_messages_once_per_executor(self, executor, orch_context, room):
+        """Test the DB count runs once and later checks use the in-memory count."""
+        room.max_interactions = 100
+
+        await executor.execute(tape=_tape(), orch_context=orch_context)
+        await executor.execute(tape=_tape(), orch_context=orch_context)
+
+        executor._count_agent_messages.assert_awaited_once()
+        assert executor.response_generator.generate_response.await_count == 6
+
+    async def test_stops_when_responses_reach_limit(self, executor, orch_context, room):
+        """Test responses produced during execution count toward the limit."""
+        room.max_interactions = 10
+        executor._count_agent_messages.return_value = 8
+
+        result = await executor.execute(tape=_tape(), orch_context=orch_context)
+
+        assert result.reached_limit is True
+        assert result.total_responses == 2
+
+    async def test_skips_count_without_limit(self, executor, orch_context, room):
+        """Test rooms without max_interactions never query the count."""
+        await executor.execute(tape=_tape(), orch_context=orch_context)
+
+        executor._count_agent_messages.assert_not_awaited()
+
+
+class TestRoomSharing:
+    """Tests for handing the pause-check room to response generation."""
+
+    async def test_room_is_shared_with_cell_and_cleared_after(self, executor, orch_context, room):
+        """Test generate_response sees the room fetched for the cell, and it is reset afterwards."""
+        seen_rooms = []
+
+        async def generate_response(orch_context, **kwargs):
+            seen_rooms.append(orch_context.room)
+            return True
+
+        executor.response_generator.generate_response.side_effect = generate_response
+
+        await executor.execute(tape=_tape(), orch_context=orch_context)
+
+        assert seen_rooms == [room, room, room]
+        assert orch_context.room is None
+
+
+class TestConcurrentCell:
+    """Tests for concurrent cell fan-out."""
+
+    async def test_error_in_one_agent_does_not_cancel_others(self, executor, orch_context, room):
+        """Test a failing agent is logged while its siblings still finish."""
+
+        async def generate_response(orch_context, agent, **kwargs):
+            if agent.id == 2:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0)
+            return True
+
+        executor.response_generator.generate_response.side_effect = generate_response
+        tape = TurnTape(cells=[TurnCell(cell_type=CellType.CONCURRENT, agent_ids=list(_AGENTS))])
+
+        result = await executor.execute(tape=tape, orch_context=orch_context)
+
+        assert result.total_responses == 2
+        assert result.total_skips == 0
+
+    async def test_cancel_propagates_to_in_flight_agents(self, executor, orch_context, room):
+        """Test cancelling the executing task (as interrupt_room_processing does) cancels every agent."""
+        started, cancelled = set(), set()
+        all_started = asyncio.Event()
+
+        async def generate_response(orch_context, agent, **kwargs):
+            started.add(agent.id)
+            if len(started) == len(_AGENTS):
+                all_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.add(agent.id)
+                raise
+
+        executor.response_generator.generate_response.side_effect = generate_response
+        tape = TurnTape(cells=[TurnCell(cell_type=CellType.CONCURRENT, agent_ids=list(_AGENTS))])
+
+        task = asyncio.create_task(executor.execute(tape=tape, orch_context=orch_context))
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled == set(_AGENTS)
+        assert orch_context.room is None
@@ -0,0 +1,55 @@
+"""
+Unit tests for the tape generator.
+
+Tests agent ordering and interrupt weaving in generated turn tapes.
+"""
+
+from types import SimpleNamespace
+
+from orchestration.tape.generator import TapeGenerator
+from orchestration.tape.models import CellType
+
+
+def _agent(agent_id: int, priority: int = 0, transparent: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(id=agent_id, name=f"Agent{agent_id}", priority=priority, transparent=transparent)
+
+
+def _sequential_ids(tape) -> list[int]:
+    return [cell.agent_ids[0] for cell in tape.cells if cell.cell_type == CellType.SEQUENTIAL]
+
+
+class TestAgentOrdering:
+    """Tests for priority ordering across rounds."""
+
+    def test_priority_agents_lead_every_round(self):
+        """Test priority agents come first, highest priority first, in every round."""
+        agents = [_agent(1), _agent(2, priority=1), _agent(3), _agent(4, priority=5)]
+        generator = TapeGenerator(agents, [])
+
+        for tape in (generator.generate_initial_round(), *(generator.generate_follow_up_round(r) for r in range(3))):
+            order = _sequential_ids(tape)
+            assert order[:2] == [4, 2]
+            assert sorted(order[2:]) == [1, 3]
+
+
+class TestInterruptWeaving:
+    """Tests for interrupt cells woven between agent cells."""
+
+    def test_initial_round_starts_with_interrupt_agents(self):
+        """Test interrupt agents answer the user before anyone else."""
+        generator = TapeGenerator([_agent(1)], [_agent(8), _agent(9)])
+
+        tape = generator.generate_initial_round()
+
+        assert tape.cells[0].cell_type == CellType.INTERRUPT
+        assert tape.cells[0].agent_ids == [8, 9]
+
+    def test_interrupt_cell_excludes_triggering_agent_and_skips_transparent(self):
+        """Test interrupt cells follow non-transparent agents and never include the trigger."""
+        agents = [_agent(1), _agent(2, transparent=1)]
+        generator = TapeGenerator(agents, [_agent(1), _agent(9)])
+
+        tape = generator.generate_follow_up_round(0)
+
+        interrupt_cells = [cell for cell in tape.cells if cell.cell_type == CellType.INTERRUPT]
+        assert [(cell.triggering_agent_id, cell.agent_ids) for cell in interrupt_cells] == [(1, [9])]